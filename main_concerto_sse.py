@@ -1,20 +1,23 @@
 import httpx
-from mcp.server.fastmcp import FastMCP
-from typing import Dict, List, Optional, Any, Union
-import time
-import jwt
-import json
+from mcp.server.fastmcp import Context, FastMCP
+from typing import AsyncIterator, Callable, Dict, List, Optional, Any, Tuple, Union
 import os
-import requests
 from starlette.applications import Starlette
 from starlette.routing import Mount, Host
 import uvicorn
 from datetime import datetime
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from contextlib import asynccontextmanager
+from collections import OrderedDict, defaultdict
+import asyncio
+import time
+from http.cookiejar import CookieJar, DefaultCookiePolicy
 
-# Disable SSL warnings if you're using verify=False
-import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from utils.versaAuth import TokenManager
+from utils.versaBreaker import retry_delay
+from utils.versaHttp import create_async_client, env_bool, env_float, env_int
+from utils.versaState import create_state
 
 class Concerto:
     def __init__(self, url, username, password):
@@ -28,30 +31,50 @@ class Concerto:
                "password": self.password,
                "scope": "global",
                "grant_type": "password"}
-        self.regen_token()
+        self._client: Optional[httpx.AsyncClient] = None
+        # Logs in on the first tool call, or at startup with VN_AUTH_WARMUP=1
+        self.auth = TokenManager(f"{self.url}/portalapi/v1/auth/token", self.payload, client=lambda: self.client, state=create_state())
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client shared by every Concerto request (tools, SAC and logins), created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = create_async_client(
+                timeout=httpx.Timeout(env_float("VN_SAC_TIMEOUT", 60.0), connect=10.0),
+                # Never keep response cookies: SAC sessions pass theirs explicitly and must not leak into other calls
+                cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+            )
+        return self._client
 
-    def regen_token(self):
-        resp = requests.request("POST", url=f"{self.url}/portalapi/v1/auth/token",
-                        headers={"Content-Type": "application/json", "Accept": "application/json"},
-                        data=json.dumps(self.payload),
-                        verify=False)
+    async def aclose(self):
+        """Close the pooled client and its keep-alive connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
-        mydata = resp.text
-        jsondata = json.loads(mydata)
-        self.access_token = jsondata['access_token']
-        self.headers =   {
-              'Authorization': f'Bearer {self.access_token}',
-              "Accept": "application/json",
-              "Content-Type": "application/json",
-            }
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """Starlette lifespan hook that optionally logs in ahead of the first tool call and closes the pool on shutdown"""
+        if env_bool("VN_AUTH_WARMUP", False):
+            self.auth.warm_up()
+        try:
+            yield
+        finally:
+            await self.aclose()
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self.auth.access_token
 
-    def get_header(self):
-        decoded_token = jwt.decode(self.access_token, options={"verify_signature": False})
-        exp = decoded_token['exp']
-        if int(exp) <= int(time.time()):
-            self.regen_token()
+    async def regen_token(self):
+        """Force a new login"""
+        await self.auth.refresh(force=True)
 
-        return self.headers
+    async def get_header(self) -> Dict[str, str]:
+        return await self.auth.get_header()
+
+    async def get_token(self) -> str:
+        return await self.auth.get_token()
 
 # ============================================================================
 # SAC Models and Configuration
@@ -60,11 +83,18 @@ class Concerto:
 @dataclass
 class SACConfig:
     """SAC application configuration"""
-    concerto_url: str = os.environ['CONCERTO_URL'] 
-    username: str = os.environ.get('CONCERTO_USERNAME', os.environ['VN_USERNAME'])
-    password: str = os.environ.get('CONCERTO_PASSWORD', os.environ['VN_PASSWORD'])
-    client_id: str = os.environ.get('VN_CONCERTO_CLIENT_ID', os.environ['VN_CLIENT_ID'])
-    client_secret: str = os.environ.get('VN_CONCERTO_CLIENT_SECRET', os.environ['VN_CLIENT_SECRET'])
+    # Read from the environment when the config is created, not when the module is imported
+    concerto_url: str = field(default_factory=lambda: os.environ['CONCERTO_URL'])
+    username: str = field(default_factory=lambda: os.environ.get('CONCERTO_USERNAME') or os.environ['VN_USERNAME'])
+    password: str = field(default_factory=lambda: os.environ.get('CONCERTO_PASSWORD') or os.environ['VN_PASSWORD'])
+    client_id: str = field(default_factory=lambda: os.environ.get('VN_CONCERTO_CLIENT_ID') or os.environ['VN_CLIENT_ID'])
+    client_secret: str = field(default_factory=lambda: os.environ.get('VN_CONCERTO_CLIENT_SECRET') or os.environ['VN_CLIENT_SECRET'])
+    # Rules deleted at the same time by delete_sac_rules
+    delete_concurrency: int = field(default_factory=lambda: max(1, env_int('VN_SAC_DELETE_CONCURRENCY', 8)))
+    # Tenants whose UUID, resources and gateway template are kept cached
+    max_tenants: int = field(default_factory=lambda: max(1, env_int('VN_SAC_MAX_TENANTS', 256)))
+    # Retries of a configure_sac_rules_bulk post rejected with a versionControl conflict
+    conflict_retries: int = 3
     
     # Default values
     default_os_versions: List[str] = field(default_factory=lambda: [
@@ -74,9 +104,9 @@ class SACConfig:
 @dataclass
 class AuthenticationContext:
     """Holds authentication state"""
-    session: requests.Session
+    # Session cookies from the login, sent as a Cookie header so the pooled client stays shareable
+    cookies: Dict[str, str]
     headers: Dict[str, str]
-    tenant_uuid: str = ""
 
 @dataclass
 class GatewayInfo:
@@ -98,6 +128,16 @@ class GatewayInfo:
     text: Optional[str] = None
     value: Optional[str] = None
 
+@dataclass
+class SACRuleSpec:
+    """One rule to create with configure_sac_rules_bulk"""
+    rule_name: str
+    selected_usernames: Optional[List[str]] = None
+    selected_operating_systems: Optional[List[str]] = None
+    place_rule_top: bool = True
+    selected_eip_agent_name: Optional[str] = None
+    selected_eip_profile_names: Optional[List[str]] = None
+
 @dataclass
 class SACResources:
     """Container for all SAC resources. When asked display the relevant informations"""
@@ -106,10 +146,36 @@ class SACResources:
     sase_gateways_full: Dict[str, Any]
     scim_users: List[Dict[str, Any]]
     client_rules: List[Dict[str, Any]]
-    client_rules_full: Dict[str, Any]
     eip_profiles: List[Dict[str, Any]]
     eip_agents: List[Dict[str, Any]]
     version_control: int
+    tenant_uuid: str = ""
+    # Resources that could not be fetched, by field name, with the error message
+    errors: Dict[str, str] = field(default_factory=dict)
+    
+    # Name indexes, built on first use and kept for the life of this snapshot;
+    # a changed snapshot is a new instance (dataclasses.replace), so they never go stale.
+    # Built in reverse so the first item with a given name wins, as with a linear scan
+    @cached_property
+    def scim_users_by_name(self) -> Dict[str, Dict[str, Any]]:
+        return {user["user_name"]: user for user in reversed(self.scim_users)}
+    
+    @cached_property
+    def gateways_by_name(self) -> Dict[str, Dict[str, Any]]:
+        """Full gateway data by gatewayName; the first region listing a gateway wins"""
+        gateways = {}
+        for region in self.sase_gateways_full.get("data", []):
+            for gw_info in region.get("saseGatewayInfos", []):
+                gateways.setdefault(gw_info.get("gatewayName"), gw_info)
+        return gateways
+    
+    @cached_property
+    def eip_agents_by_name(self) -> Dict[str, Dict[str, str]]:
+        return {agent["name"]: agent for agent in reversed(self.eip_agents)}
+    
+    @cached_property
+    def eip_profiles_by_name(self) -> Dict[str, Dict[str, str]]:
+        return {profile["name"]: profile for profile in reversed(self.eip_profiles)}
 
 class Logger:
     """Simple logging utility"""
@@ -128,7 +194,7 @@ concerto = Concerto(url=os.environ['CONCERTO_URL'], username=os.environ['VN_USER
 mcp = FastMCP(
     name="Concerto API Server with SAC Support", 
     instructions="This server provides optimized access to Versa Concerto APIs through logical groupings, including comprehensive Secure Access Client (SAC) rule management capabilities", 
-    dependencies=["requests", "urllib3", "pyjwt"]
+    dependencies=["pyjwt", "httpx[http2]"]
 )
 
 def get_header(access_token: str) -> Dict[str, str]:
@@ -149,34 +215,16 @@ async def make_api_request(
 ) -> Dict[str, Any]:
     """Generic API request helper"""
     full_url = f"{url}/portalapi{endpoint}"
+    method = method.upper()
     
-    async with httpx.AsyncClient(verify=False) as client:
-        if method.upper() == "GET":
-            response = await client.get(
-                full_url,
-                headers=get_header(access_token),
-                params=params or {}
-            )
-        elif method.upper() == "POST":
-            response = await client.post(
-                full_url,
-                headers=get_header(access_token),
-                params=params or {},
-                json=body
-            )
-        elif method.upper() == "PUT":
-            response = await client.put(
-                full_url,
-                headers=get_header(access_token),
-                params=params or {},
-                json=body
-            )
-        elif method.upper() == "DELETE":
-            response = await client.delete(
-                full_url,
-                headers=get_header(access_token),
-                params=params or {}
-            )
+    # Reuses the pooled keep-alive connections instead of a new TLS session per call
+    response = await concerto.client.request(
+        method,
+        full_url,
+        headers=get_header(access_token),
+        params=params or {},
+        json=body if method in ("POST", "PUT") else None
+    )
     
     try:
         return response.json()
@@ -190,29 +238,52 @@ async def make_api_request(
 class SACApiClient:
     """Handles all API interactions with the SAC system"""
     
-    def __init__(self, config: SACConfig):
+    def __init__(self, config: SACConfig, client: Optional[Callable[[], httpx.AsyncClient]] = None):
         self.config = config
         self._auth_context: Optional[AuthenticationContext] = None
+        self._auth_lock = asyncio.Lock()
+        # A shared pool is used when given (and closed by its owner), otherwise one of our own
+        self._shared_client = client
+        self._client: Optional[httpx.AsyncClient] = None
+        # Tenant name -> UUID, least recently used first; one process serves many tenants
+        self._tenant_uuids: OrderedDict[str, str] = OrderedDict()
         
     @property
-    def auth_context(self) -> AuthenticationContext:
-        """Get or create authentication context"""
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client reused by every SAC request, created on first use"""
+        if self._shared_client is not None:
+            return self._shared_client()
+        if self._client is None or self._client.is_closed:
+            self._client = create_async_client(timeout=httpx.Timeout(env_float("VN_SAC_TIMEOUT", 60.0), connect=10.0))
+        return self._client
+        
+    async def aclose(self):
+        """Close the pooled client and its keep-alive connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        
+    async def get_auth_context(self) -> AuthenticationContext:
+        """Get or create authentication context; concurrent callers share one login"""
         if not self._auth_context:
-            self._auth_context = self._authenticate()
+            async with self._auth_lock:
+                if not self._auth_context:
+                    self._auth_context = await self._authenticate()
         return self._auth_context
         
-    def _authenticate(self) -> AuthenticationContext:
+    async def _authenticate(self) -> AuthenticationContext:
         """Authenticate with the SAC API"""
-        session = requests.Session()
+        cookies: Dict[str, str] = {}
         
         # Get CSRF token
-        csrf_response = session.get(
-            f"{self.config.concerto_url}/portalapi/swagger-ui.html", 
-            verify=False
+        csrf_response = await self.client.get(
+            f"{self.config.concerto_url}/portalapi/swagger-ui.html",
+            follow_redirects=True
         )
+        for response in [*csrf_response.history, csrf_response]:
+            cookies.update(response.cookies)
         
         # Extract CSRF token using the same method as the working function
-        cookies = session.cookies.get_dict()
         csrf_token = cookies.get("ECP-CSRF-TOKEN")
         if not csrf_token:
             raise ValueError("CSRF token not found")
@@ -236,74 +307,85 @@ class SACApiClient:
             "client_secret": self.config.client_secret
         }
         
-        # Fixed: Explicitly pass cookies in the POST request
-        token_response = session.post(
+        # The token endpoint checks the CSRF cookie against the X-CSRF-Token header
+        token_response = await self.client.post(
             f"{self.config.concerto_url}/portalapi/v1/auth/token",
-            headers=headers,
-            cookies=session.cookies,  # <-- This was missing!
-            data=login_data,
-            verify=False
+            headers={**headers, "cookie": self._cookie_header(cookies)},
+            data=login_data
         )
         token_response.raise_for_status()
+        cookies.update(token_response.cookies)
         
         access_token = token_response.json().get("access_token")
         headers["authorization"] = f"Bearer {access_token}"
         headers["accept-language"] = "en"
+        headers["cookie"] = self._cookie_header(cookies)
         
         Logger.log("Authentication successful")
         
         return AuthenticationContext(
-            session=session,
+            cookies=cookies,
             headers=headers
         )
-    def get_tenant_uuid(self, tenant_name: str) -> str:
+        
+    @staticmethod
+    def _cookie_header(cookies: Dict[str, str]) -> str:
+        return "; ".join(f"{name}={value}" for name, value in cookies.items())
+        
+    async def get_tenant_uuid(self, tenant_name: str) -> str:
         """Get tenant UUID by name"""
         # Check if we already have it
-        if self.auth_context.tenant_uuid:
-            return self.auth_context.tenant_uuid
+        uuid = self._tenant_uuids.get(tenant_name)
+        if uuid:
+            self._tenant_uuids.move_to_end(tenant_name)
+            return uuid
             
+        auth_context = await self.get_auth_context()
         url = f"{self.config.concerto_url}/portalapi/v1/tenants/tenant/name/{tenant_name}"
-        response = self.auth_context.session.get(
+        response = await self.client.get(
             url, 
-            headers=self.auth_context.headers, 
-            verify=False
+            headers=auth_context.headers
         )
         response.raise_for_status()
         
         uuid = response.json().get("tenantInfo", {}).get("uuid")
-        self.auth_context.tenant_uuid = uuid
-        Logger.log(f"Tenant UUID: {uuid}")
+        if not uuid:
+            raise ValueError(f"Tenant '{tenant_name}' not found")
+        self._tenant_uuids[tenant_name] = uuid
+        while len(self._tenant_uuids) > self.config.max_tenants:
+            self._tenant_uuids.popitem(last=False)
+        Logger.log(f"Tenant UUID for {tenant_name}: {uuid}")
         return uuid
         
-    def fetch_resource(self, url: str) -> Any:
+    async def fetch_resource(self, url: str) -> Any:
         """Fetch a resource from the API"""
-        response = self.auth_context.session.get(
+        auth_context = await self.get_auth_context()
+        response = await self.client.get(
             url,
-            headers=self.auth_context.headers,
-            verify=False
+            headers=auth_context.headers
         )
         response.raise_for_status()
         return response.json()
         
-    def post_resource(self, url: str, data: Dict[str, Any]) -> requests.Response:
+    async def post_resource(self, url: str, data: Dict[str, Any]) -> httpx.Response:
         """Post data to the API"""
-        headers = self.auth_context.headers.copy()
-        headers["Content-Type"] = "application/json"
+        auth_context = await self.get_auth_context()
+        headers = auth_context.headers.copy()
+        headers["content-type"] = "application/json"
         
-        response = self.auth_context.session.post(
+        response = await self.client.post(
             url,
             headers=headers,
-            json=data,
-            verify=False
+            json=data
         )
         return response
         
-    def delete_resource(self, url: str) -> requests.Response:
+    async def delete_resource(self, url: str) -> httpx.Response:
         """Delete a resource"""
-        return self.auth_context.session.delete(
+        auth_context = await self.get_auth_context()
+        return await self.client.delete(
             url,
-            headers=self.auth_context.headers,
-            verify=False
+            headers=auth_context.headers
         )
         
     def reset_auth(self):
@@ -314,53 +396,180 @@ class SACApiClient:
 # SAC Resource Manager
 # ============================================================================
 
+@dataclass
+class ResourceSnapshot:
+    """SAC resources of one tenant kept between tool calls"""
+    resources: SACResources
+    expires_at: float
+    # Set when this server changed the rule set, so the rules are re-read on next use
+    rules_stale: bool = False
+
 class ResourceManager:
     """Manages fetching SAC resources"""
     
     def __init__(self, api_client: SACApiClient, config: SACConfig):
         self.api_client = api_client
         self.config = config
+        # Per-tenant snapshot cache; VN_SAC_CACHE_TTL=0 fetches everything on every call
+        self.cache_ttl = env_float("VN_SAC_CACHE_TTL", 300.0)
+        # Tenant UUID -> snapshot, least recently used first, bounded like the tenant name map
+        self._snapshots: OrderedDict[str, ResourceSnapshot] = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Items requested per window from the nextWindowNumber/windowSize list endpoints
+        self.window_size = max(1, env_int("VN_SAC_WINDOW_SIZE", 500))
+        
+    async def fetch_all_resources(self, tenant_name: str, refresh: bool = False) -> SACResources:
+        """
+        Return the SAC resources of a tenant, from the snapshot cache when possible.
+        
+        A snapshot is reused until VN_SAC_CACHE_TTL expires. Only its rules are
+        re-read, after this server posted or deleted a rule or when a one-rule
+        probe shows that versionControl moved, so the SCIM users, gateways and
+        profiles are not downloaded again for every rule change.
+        """
+        tenant_uuid = await self.api_client.get_tenant_uuid(tenant_name)
+        
+        # One caller per tenant fetches; concurrent callers wait and reuse its snapshot
+        async with self._locks[tenant_uuid]:
+            snapshot = self._snapshots.get(tenant_uuid)
+            if refresh or snapshot is None or time.monotonic() >= snapshot.expires_at:
+                resources = await self._fetch_snapshot(tenant_uuid)
+                if self.cache_ttl > 0 and not resources.errors:
+                    self._store(tenant_uuid, ResourceSnapshot(resources, time.monotonic() + self.cache_ttl))
+                else:
+                    self._snapshots.pop(tenant_uuid, None)
+                return resources
+            self._snapshots.move_to_end(tenant_uuid)
+                
+            if not snapshot.rules_stale and await self.fetch_version_control(tenant_uuid) == snapshot.resources.version_control:
+                return snapshot.resources
+                
+            try:
+                rules_data = await self._fetch_client_rules(tenant_uuid)
+            except Exception as e:
+                Logger.log(f"Error fetching client_rules: {str(e)}", "ERROR")
+                snapshot.rules_stale = True
+                return replace(snapshot.resources, errors={**snapshot.resources.errors, "client_rules": str(e) or type(e).__name__})
+                
+            snapshot.resources = replace(
+                snapshot.resources,
+                client_rules=rules_data["rules"],
+                version_control=rules_data["version_control"]
+            )
+            snapshot.rules_stale = False
+            return snapshot.resources
+            
+    def _store(self, tenant_uuid: str, snapshot: ResourceSnapshot):
+        """Cache a snapshot, evicting the least recently used tenants beyond VN_SAC_MAX_TENANTS"""
+        self._snapshots[tenant_uuid] = snapshot
+        self._snapshots.move_to_end(tenant_uuid)
+        while len(self._snapshots) > self.config.max_tenants:
+            evicted, _ = self._snapshots.popitem(last=False)
+            lock = self._locks.get(evicted)
+            if lock is not None and not lock.locked():
+                del self._locks[evicted]
+            
+    def invalidate_rules(self, tenant_uuid: str):
+        """Re-read the rules of a tenant on next use, after a post or delete"""
+        snapshot = self._snapshots.get(tenant_uuid)
+        if snapshot is not None:
+            snapshot.rules_stale = True
+            
+    async def fetch_version_control(self, tenant_uuid: str) -> Optional[int]:
+        """Current rules versionControl, read with a one-rule window; None if it cannot be read"""
+        url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/sase/secure-access-client/summarize/rule?nextWindowNumber=0&windowSize=1"
+        try:
+            data = await self.api_client.fetch_resource(url)
+        except Exception as e:
+            Logger.log(f"Error probing versionControl: {str(e)}", "WARNING")
+            return None
+        return data.get("versionControl")
+        
+    async def _fetch_snapshot(self, tenant_uuid: str) -> SACResources:
+        """Fetch all SAC resources of a tenant and return as structured data"""
+        # Fetch all resources in parallel; a failed fetch leaves its resource
+        # empty and is reported in resources.errors instead of failing the rest
+        fetches = {
+            "authentication_profiles": (self._fetch_authentication_profiles, []),
+            "sase_gateways": (self._fetch_gateways_full, {}),
+            "scim_users": (self._fetch_scim_users, []),
+            "client_rules": (self._fetch_client_rules, {"rules": [], "version_control": 0}),
+            "eip_profiles": (self._fetch_eip_profiles, []),
+            "eip_agents": (self._fetch_eip_agents, []),
+        }
+        results = await asyncio.gather(
+            *(fetch(tenant_uuid) for fetch, _ in fetches.values()),
+            return_exceptions=True
+        )
         
-    def fetch_all_resources(self, tenant_name: str) -> SACResources:
-        """Fetch all SAC resources and return as structured data"""
-        tenant_uuid = self.api_client.get_tenant_uuid(tenant_name)
+        values = {}
+        errors = {}
+        for (name, (_, default)), result in zip(fetches.items(), results):
+            if isinstance(result, BaseException):
+                Logger.log(f"Error fetching {name}: {str(result)}", "ERROR")
+                errors[name] = str(result) or type(result).__name__
+                values[name] = default
+            else:
+                values[name] = result
         
-        # Fetch all resources in parallel (conceptually)
         resources = SACResources(
-            authentication_profiles=self._fetch_authentication_profiles(tenant_uuid),
-            sase_gateways=[], # Will be populated from full data
-            sase_gateways_full=self._fetch_gateways_full(tenant_uuid),
-            scim_users=self._fetch_scim_users(tenant_uuid),
-            client_rules=[], # Will be populated from full data
-            client_rules_full=self._fetch_client_rules_full(tenant_uuid),
-            eip_profiles=self._fetch_eip_profiles(tenant_uuid),
-            eip_agents=self._fetch_eip_agents(tenant_uuid),
-            version_control=0 # Will be set from client rules
+            authentication_profiles=values["authentication_profiles"],
+            sase_gateways=self._extract_gateways(values["sase_gateways"]),
+            sase_gateways_full=values["sase_gateways"],
+            scim_users=values["scim_users"],
+            client_rules=values["client_rules"]["rules"],
+            eip_profiles=values["eip_profiles"],
+            eip_agents=values["eip_agents"],
+            version_control=values["client_rules"]["version_control"],
+            tenant_uuid=tenant_uuid,
+            errors=errors
         )
         
-        # Extract simplified data from full responses
-        resources.sase_gateways = self._extract_gateways(resources.sase_gateways_full)
-        rules_data = self._extract_client_rules(resources.client_rules_full)
-        resources.client_rules = rules_data["rules"]
-        resources.version_control = rules_data["version_control"]
-        
         return resources
         
-    def _fetch_authentication_profiles(self, tenant_uuid: str) -> List[Dict[str, Any]]:
+    async def _iter_windows(self, url: str) -> AsyncIterator[Any]:
+        """
+        Yield the pages of a nextWindowNumber/windowSize list endpoint in order.
+        
+        Each window is parsed and handed to the caller before the next one is
+        requested, so only one window of raw JSON is held at a time. Stops at a
+        short window or once totalCount items have been seen.
+        """
+        window_number = 0
+        seen = 0
+        while True:
+            data = await self.api_client.fetch_resource(f"{url}?nextWindowNumber={window_number}&windowSize={self.window_size}")
+            yield data
+            
+            items = data if isinstance(data, list) else data.get("data", [])
+            total = data.get("totalCount") if isinstance(data, dict) else None
+            seen += len(items)
+            # More items than asked for means the endpoint ignored the window and returned everything
+            if len(items) != self.window_size or (total is not None and seen >= total):
+                return
+            window_number += 1
+            
+    async def _fetch_name_uuid_items(self, url: str) -> List[Dict[str, str]]:
+        """Fetch a windowed list endpoint, keeping only the name and uuid of each item"""
+        items = []
+        async for data in self._iter_windows(url):
+            items.extend(self._extract_name_uuid_items(data))
+        return items
+        
+    async def _fetch_authentication_profiles(self, tenant_uuid: str) -> List[Dict[str, Any]]:
         """Fetch authentication profiles"""
-        url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/sase/secure-access-client/summarize/profile?nextWindowNumber=0&windowSize=2147483647"
-        data = self.api_client.fetch_resource(url)
-        return self._extract_name_uuid_items(data)
+        url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/sase/secure-access-client/summarize/profile"
+        return await self._fetch_name_uuid_items(url)
         
-    def _fetch_gateways_full(self, tenant_uuid: str) -> Dict[str, Any]:
+    async def _fetch_gateways_full(self, tenant_uuid: str) -> Dict[str, Any]:
         """Fetch full gateway data"""
         url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/regions/sasegateways"
-        return self.api_client.fetch_resource(url)
+        return await self.api_client.fetch_resource(url)
         
-    def _fetch_scim_users(self, tenant_uuid: str) -> List[Dict[str, Any]]:
+    async def _fetch_scim_users(self, tenant_uuid: str) -> List[Dict[str, Any]]:
         """Fetch SCIM users and display the available users when asked by user"""
         url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/sase/scim/summarize?global=&include-user-group=true"
-        data = self.api_client.fetch_resource(url)
+        data = await self.api_client.fetch_resource(url)
         
         users = []
         for entry in data.get("data", []):
@@ -372,22 +581,42 @@ class ResourceManager:
                 })
         return users
         
-    def _fetch_client_rules_full(self, tenant_uuid: str) -> Dict[str, Any]:
-        """Fetch full client rules data"""
-        url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/sase/secure-access-client/summarize/rule?nextWindowNumber=0&windowSize=2147483647"
-        return self.api_client.fetch_resource(url)
+    async def _fetch_client_rules(self, tenant_uuid: str, attempts: int = 3) -> Dict[str, Any]:
+        """Fetch client rules window by window, with the versionControl they belong to; raises if they never list consistently"""
+        url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/sase/secure-access-client/summarize/rule"
+        for attempt in range(attempts):
+            rules = []
+            version_control = None
+            consistent = True
+            async for data in self._iter_windows(url):
+                rules_data = self._extract_client_rules(data)
+                if version_control is None:
+                    version_control = rules_data["version_control"]
+                elif rules_data["version_control"] != version_control:
+                    # The rules changed between windows; the listing may have skipped or repeated rules
+                    consistent = False
+                    break
+                rules.extend(rules_data["rules"])
+            if consistent:
+                break
+            Logger.log(f"Client rules changed while listing them, retrying ({attempt + 1}/{attempts})", "WARNING")
+        else:
+            raise ValueError(f"Client rules kept changing while listing them ({attempts} attempts)")
+            
+        return {
+            "rules": rules,
+            "version_control": version_control or 0
+        }
         
-    def _fetch_eip_profiles(self, tenant_uuid: str) -> List[Dict[str, Any]]:
+    async def _fetch_eip_profiles(self, tenant_uuid: str) -> List[Dict[str, Any]]:
         """Fetch all EIP profiles and display for the user to choose when asked. Try to filter as well."""
-        url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/director-mapping/eip-profile?nextWindowNumber=0&windowSize=2147483647"
-        data = self.api_client.fetch_resource(url)
-        return self._extract_name_uuid_items(data)
+        url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/director-mapping/eip-profile"
+        return await self._fetch_name_uuid_items(url)
         
-    def _fetch_eip_agents(self, tenant_uuid: str) -> List[Dict[str, Any]]:
+    async def _fetch_eip_agents(self, tenant_uuid: str) -> List[Dict[str, Any]]:
         """Fetch all EIP agents"""
-        url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/director-mapping/eip-agent?nextWindowNumber=0&windowSize=2147483647"
-        data = self.api_client.fetch_resource(url)
-        return self._extract_name_uuid_items(data)
+        url = f"{self.config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/director-mapping/eip-agent"
+        return await self._fetch_name_uuid_items(url)
         
     def _extract_name_uuid_items(self, data: Any) -> List[Dict[str, str]]:
         """Extract items with name and uuid from response data"""
@@ -410,7 +639,7 @@ class ResourceManager:
         return gateways
         
     def _extract_client_rules(self, rules_full: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract client rules and version control from full data"""
+        """Extract client rules and version control from one window of rules data"""
         rules = [
             {"name": rule.get("name"), "uuid": rule.get("uuid")}
             for rule in rules_full.get("data", [])
@@ -433,6 +662,25 @@ class SACRuleBuilder:
     
     def __init__(self, config: SACConfig):
         self.config = config
+        # Gateway infos and groups by tenant UUID, with the gateway payload they
+        # were built from. They only depend on the gateway data, which cached
+        # snapshots of a tenant share even when their rules are re-read, so
+        # they are built once per gateway fetch; a new fetch replaces the
+        # tenant's entry instead of adding one.
+        self._gateway_templates: OrderedDict[str, Tuple[Dict[str, Any], List[Dict[str, Any]], List[str]]] = OrderedDict()
+        
+    def gateway_template(self, resources: SACResources) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Gateway infos and gateway groups for rules of this snapshot; shared, do not modify"""
+        key = resources.tenant_uuid
+        entry = self._gateway_templates.get(key)
+        if entry is None or entry[0] is not resources.sase_gateways_full:
+            gateway_infos = self._build_gateway_infos(resources)
+            entry = (resources.sase_gateways_full, gateway_infos, self._build_gateway_groups(gateway_infos))
+            self._gateway_templates[key] = entry
+            while len(self._gateway_templates) > self.config.max_tenants:
+                self._gateway_templates.popitem(last=False)
+        self._gateway_templates.move_to_end(key)
+        return entry[1], entry[2]
         
     def build_rule(
         self,
@@ -447,6 +695,14 @@ class SACRuleBuilder:
     ) -> Dict[str, Any]:
         """Build a SAC rule payload"""
         
+        # Refuse to build a rule from resources that failed to load
+        required = ["authentication_profiles", "sase_gateways", "scim_users", "client_rules"]
+        if add_eip:
+            required += ["eip_agents", "eip_profiles"]
+        failed = [name for name in required if name in resources.errors]
+        if failed:
+            raise ValueError(f"Could not fetch {', '.join(failed)}: " + "; ".join(resources.errors[name] for name in failed))
+        
         # Set defaults
         if not selected_users:
             selected_users = [user["user_name"] for user in resources.scim_users]
@@ -454,10 +710,7 @@ class SACRuleBuilder:
             selected_os = self.config.default_os_versions
             
         # Build gateway infos
-        gateway_infos = self._build_gateway_infos(
-            resources.sase_gateways, 
-            resources.sase_gateways_full
-        )
+        gateway_infos, gateway_groups = self.gateway_template(resources)
         if not gateway_infos:
             raise ValueError("No valid gateways found")
             
@@ -466,10 +719,11 @@ class SACRuleBuilder:
             rule_name=rule_name,
             sac_profile_uuid=resources.authentication_profiles[0]["uuid"],
             gateway_infos=gateway_infos,
+            gateway_groups=gateway_groups,
             vpn_name=gateway_infos[0]["vpnName"],
             selected_users=selected_users,
             selected_os=selected_os,
-            scim_users=resources.scim_users,
+            scim_users_by_name=resources.scim_users_by_name,
             version_control=resources.version_control,
             place_rule_top=place_rule_top
         )
@@ -480,30 +734,21 @@ class SACRuleBuilder:
                 payload, 
                 eip_agent_name, 
                 eip_profile_names,
-                resources.eip_agents,
-                resources.eip_profiles
+                resources.eip_agents_by_name,
+                resources.eip_profiles_by_name
             )
             
         return payload
         
-    def _build_gateway_infos(
-        self, 
-        gateways: List[Dict], 
-        gateways_full: Dict
-    ) -> List[Dict[str, Any]]:
+    def _build_gateway_infos(self, resources: SACResources) -> List[Dict[str, Any]]:
         """Build gateway information objects"""
         gateway_infos = []
         
-        for gateway in gateways:
-            gateway_name = gateway["gatewayName"]
-            
+        for gateway in resources.sase_gateways:
             # Find full gateway info
-            for region in gateways_full.get("data", []):
-                for gw_info in region.get("saseGatewayInfos", []):
-                    if gw_info.get("gatewayName") == gateway_name:
-                        gateway_info = self._create_gateway_info(gw_info)
-                        gateway_infos.append(gateway_info)
-                        break
+            gw_info = resources.gateways_by_name.get(gateway["gatewayName"])
+            if gw_info is not None:
+                gateway_infos.append(self._create_gateway_info(gw_info))
                         
         return gateway_infos
         
@@ -569,14 +814,14 @@ class SACRuleBuilder:
         rule_name: str,
         sac_profile_uuid: str,
         gateway_infos: List[Dict],
+        gateway_groups: List[str],
         vpn_name: str,
         selected_users: List[str],
         selected_os: List[str],
-        scim_users: List[Dict],
+        scim_users_by_name: Dict[str, Dict],
         version_control: int,
         place_rule_top: bool
     ) -> Dict[str, Any]:
-        gateway_groups = self._build_gateway_groups(gateway_infos)
         """Create base rule payload"""
         return {
             "name": rule_name,
@@ -636,10 +881,7 @@ class SACRuleBuilder:
                         "users": {
                             "users": [
                                 {
-                                    "name": next(
-                                        (u["display_name"] for u in scim_users if u["user_name"] == user),
-                                        user
-                                    ),
+                                    "name": scim_users_by_name[user]["display_name"] if user in scim_users_by_name else user,
                                     "id": user,
                                     "description": "testing"
                                 }
@@ -671,15 +913,12 @@ class SACRuleBuilder:
         payload: Dict[str, Any],
         eip_agent_name: Optional[str],
         eip_profile_names: Optional[List[str]],
-        eip_agents: List[Dict[str, str]],
-        eip_profiles: List[Dict[str, str]]
+        eip_agents_by_name: Dict[str, Dict[str, str]],
+        eip_profiles_by_name: Dict[str, Dict[str, str]]
     ) -> None:
         """Add EIP configuration to payload"""
         if eip_agent_name:
-            agent = next(
-                (a for a in eip_agents if a["name"] == eip_agent_name),
-                None
-            )
+            agent = eip_agents_by_name.get(eip_agent_name)
             if not agent:
                 raise ValueError(f"EIP Agent '{eip_agent_name}' not found")
                 
@@ -693,10 +932,7 @@ class SACRuleBuilder:
             matched_profiles = []
             
             for profile_name in eip_profile_names:
-                profile = next(
-                    (p for p in eip_profiles if p["name"] == profile_name),
-                    None
-                )
+                profile = eip_profiles_by_name.get(profile_name)
                 if not profile:
                     raise ValueError(f"EIP Profile '{profile_name}' not found")
                     
@@ -757,7 +993,7 @@ async def manage_notifications(
     if action.startswith("get_tenant_") and not tenant_uuid:
         return {"error": "tenant_uuid is required for tenant-specific actions"}
     
-    return await make_api_request(concerto.url, endpoint_map[action], concerto.access_token, params=params)
+    return await make_api_request(concerto.url, endpoint_map[action], await concerto.get_token(), params=params)
 
 @mcp.tool()
 async def manage_sase_operations(
@@ -903,7 +1139,7 @@ async def manage_sase_operations(
     else:
         return {"error": f"Invalid action. Available actions: list_resources, get_resource, get_summary"}
     
-    return await make_api_request(concerto.url, endpoint, concerto.access_token, params=filters)
+    return await make_api_request(concerto.url, endpoint, await concerto.get_token(), params=filters)
 
 @mcp.tool()
 async def manage_sdwan_operations(
@@ -971,7 +1207,7 @@ async def manage_sdwan_operations(
     else:
         return {"error": f"Invalid action. Available actions: list_resources, get_resource, get_summary"}
     
-    return await make_api_request(concerto.url, endpoint, concerto.access_token, params=filters)
+    return await make_api_request(concerto.url, endpoint, await concerto.get_token(), params=filters)
 
 @mcp.tool()
 async def manage_elements(
@@ -1043,7 +1279,7 @@ async def manage_elements(
     else:
         return {"error": f"Invalid action. Available actions: list_elements, get_element, get_summary, search_elements, get_predefined"}
     
-    return await make_api_request(concerto.url, endpoint, concerto.access_token, params=filters)
+    return await make_api_request(concerto.url, endpoint, await concerto.get_token(), params=filters)
 
 @mcp.tool()
 async def manage_policies_and_rules(
@@ -1153,7 +1389,7 @@ async def manage_policies_and_rules(
     else:
         return {"error": f"Invalid action. Available actions: list_policies, get_policy, create_policy, update_policy, delete_policy, list_rules, get_rule"}
     
-    return await make_api_request(concerto.url, endpoint, concerto.access_token, method=method, params=filters, body=rule_data)
+    return await make_api_request(concerto.url, endpoint, await concerto.get_token(), method=method, params=filters, body=rule_data)
 
 @mcp.tool()
 async def manage_tenant_resources(
@@ -1241,7 +1477,7 @@ async def manage_tenant_resources(
     else:
         return {"error": f"Invalid action. Available actions: get_info, list_files, list_subprofiles, list_global_settings, list_sites, get_site, list_profiles"}
     
-    return await make_api_request(concerto.url, endpoint, concerto.access_token)
+    return await make_api_request(concerto.url, endpoint, await concerto.get_token())
 
 # ============================================================================
 # SAC MCP Tools Setup
@@ -1249,18 +1485,19 @@ async def manage_tenant_resources(
 
 # Initialize SAC components
 sac_config = SACConfig()
-sac_api_client = SACApiClient(sac_config)
+sac_api_client = SACApiClient(sac_config, client=lambda: concerto.client)
 sac_resource_manager = ResourceManager(sac_api_client, sac_config)
 sac_rule_builder = SACRuleBuilder(sac_config)
 
 @mcp.tool()
-async def fetch_sac_resources(tenant_name: str) -> Dict[str, Any]:
-    """Fetch and display current SAC resources"""
+async def fetch_sac_resources(tenant_name: str, refresh: bool = False) -> Dict[str, Any]:
+    """Fetch and display current SAC resources (cached per tenant; refresh=True re-reads everything)"""
     try:
-        resources = sac_resource_manager.fetch_all_resources(tenant_name)
+        resources = await sac_resource_manager.fetch_all_resources(tenant_name, refresh=refresh)
         
         return {
-            "status": "success",
+            "status": "partial" if resources.errors else "success",
+            "errors": resources.errors,
             "data": {
                 "authentication_profiles": {
                     "count": len(resources.authentication_profiles),
@@ -1317,7 +1554,7 @@ async def configure_sac_rule_custom(
     """Configure SAC Rule with specific users and operating systems"""
     try:
         # Fetch all resources
-        resources = sac_resource_manager.fetch_all_resources(tenant_name)
+        resources = await sac_resource_manager.fetch_all_resources(tenant_name)
         
         # Build rule
         payload = sac_rule_builder.build_rule(
@@ -1329,7 +1566,7 @@ async def configure_sac_rule_custom(
         )
         
         # Post rule
-        return await _post_sac_rule(payload)
+        return await _post_sac_rule(payload, resources.tenant_uuid)
         
     except Exception as e:
         Logger.log(f"Error configuring rule: {str(e)}", "ERROR")
@@ -1354,7 +1591,7 @@ async def configure_sac_rule_with_eip(
         eip_profiles = [p.strip() for p in selected_eip_profile_names.split(",") if p.strip()] if selected_eip_profile_names else []
         
         # Fetch all resources
-        resources = sac_resource_manager.fetch_all_resources(tenant_name)
+        resources = await sac_resource_manager.fetch_all_resources(tenant_name)
         
         # Build rule
         payload = sac_rule_builder.build_rule(
@@ -1369,7 +1606,7 @@ async def configure_sac_rule_with_eip(
         )
         
         # Post rule
-        return await _post_sac_rule(payload)
+        return await _post_sac_rule(payload, resources.tenant_uuid)
         
     except Exception as e:
         Logger.log(f"Error configuring rule with EIP: {str(e)}", "ERROR")
@@ -1378,12 +1615,15 @@ async def configure_sac_rule_with_eip(
 @mcp.tool()
 async def delete_sac_rules(
     tenant_name: str,
-    rule_names: str
+    rule_names: str,
+    ctx: Context
 ) -> Dict[str, Any]:
-    """Delete one or more SAC rules based on names (comma-separated)"""
+    """Delete one or more SAC rules based on names (comma-separated), reporting progress as each rule is deleted"""
     try:
         # Fetch current resources
-        resources = sac_resource_manager.fetch_all_resources(tenant_name)
+        resources = await sac_resource_manager.fetch_all_resources(tenant_name)
+        if "client_rules" in resources.errors:
+            return {"status": "error", "message": f"Could not fetch client rules: {resources.errors['client_rules']}"}
         
         # Parse rule names
         rule_list = [r.strip() for r in rule_names.split(",") if r.strip()]
@@ -1392,34 +1632,171 @@ async def delete_sac_rules(
         if "all" in [r.lower() for r in rule_list]:
             rules_to_delete = resources.client_rules
         else:
-            rules_to_delete = [r for r in resources.client_rules if r["name"] in rule_list]
+            wanted = set(rule_list)
+            rules_to_delete = [r for r in resources.client_rules if r["name"] in wanted]
             
         if not rules_to_delete:
             return {"status": "error", "message": "No matching rules found to delete"}
             
-        # Delete rules
-        deletion_results = []
-        for rule in rules_to_delete:
-            result = await _delete_single_sac_rule(rule)
-            deletion_results.append(result)
+        # Concerto has no bulk delete for SAC rules, so delete them
+        # concurrently, at most delete_concurrency at a time
+        semaphore = asyncio.Semaphore(sac_config.delete_concurrency)
+        completed = 0
+        
+        async def delete(rule: Dict[str, str]) -> Dict[str, Any]:
+            nonlocal completed
+            async with semaphore:
+                result = await _delete_single_sac_rule(rule, resources.tenant_uuid)
+            completed += 1
+            # A lost progress notification must not hide deletions that already happened
+            try:
+                await ctx.report_progress(completed, len(rules_to_delete))
+                await ctx.info(f"{rule['name']}: {result['status']}")
+            except Exception as e:
+                Logger.log(f"Could not report delete progress: {str(e)}", "DEBUG")
+            return result
             
-        return {"status": "completed", "results": deletion_results}
+        deletion_results = await asyncio.gather(*(delete(rule) for rule in rules_to_delete))
+        deleted = sum(1 for result in deletion_results if result["status"] == "deleted")
+        
+        return {
+            "status": "completed",
+            "deleted": deleted,
+            "failed": len(deletion_results) - deleted,
+            "results": deletion_results
+        }
         
     except Exception as e:
         Logger.log(f"Error deleting rules: {str(e)}", "ERROR")
         return {"status": "error", "message": str(e)}
 
-async def _post_sac_rule(payload: Dict[str, Any]) -> Dict[str, Any]:
+@mcp.tool()
+async def configure_sac_rules_bulk(
+    tenant_name: str,
+    rules: List[SACRuleSpec],
+    ctx: Context
+) -> Dict[str, Any]:
+    """
+    Create many SAC rules in one call
+    
+    All payloads are built from one resource snapshot, then posted one at a
+    time, reporting progress as each rule is created. Rules placed at the top
+    are posted in reverse list order and rules placed at the bottom in list
+    order, so both end up in the order given. Concerto accepts one rule change
+    per versionControl value, so each post carries the value left by the
+    previous one; a post rejected because someone else changed the rules
+    meanwhile is retried with the current value.
+    
+    Parameters:
+    - tenant_name: Tenant name
+    - rules: Rule specs, each with rule_name and optionally selected_usernames
+      (list), selected_operating_systems (list), place_rule_top (default: true),
+      selected_eip_agent_name and selected_eip_profile_names (list)
+    """
+    try:
+        resources = await sac_resource_manager.fetch_all_resources(tenant_name)
+        
+        # Build every payload up front; a bad spec fails on its own without posting
+        results: List[Optional[Dict[str, Any]]] = [None] * len(rules)
+        top_payloads = []
+        bottom_payloads = []
+        for index, spec in enumerate(rules):
+            try:
+                if not spec.rule_name:
+                    raise ValueError("rule_name is required")
+                eip_agent_name = spec.selected_eip_agent_name or None
+                eip_profile_names = spec.selected_eip_profile_names or None
+                payload = sac_rule_builder.build_rule(
+                    resources=resources,
+                    rule_name=spec.rule_name,
+                    selected_users=spec.selected_usernames or None,
+                    selected_os=spec.selected_operating_systems or None,
+                    add_eip=bool(eip_agent_name or eip_profile_names),
+                    eip_agent_name=eip_agent_name,
+                    eip_profile_names=eip_profile_names,
+                    place_rule_top=spec.place_rule_top
+                )
+                (top_payloads if spec.place_rule_top else bottom_payloads).append((index, payload))
+            except Exception as e:
+                results[index] = {"rule": spec.rule_name, "status": "error", "message": str(e)}
+                
+        # Each top-placed post lands above the previous one
+        payloads = top_payloads[::-1] + bottom_payloads
+        version_control = resources.version_control
+        completed = len(rules) - len(payloads)
+        for index, payload in payloads:
+            results[index], version_control = await _post_sac_rule_versioned(payload, resources.tenant_uuid, version_control)
+            completed += 1
+            try:
+                await ctx.report_progress(completed, len(rules))
+                await ctx.info(f"{payload['name']}: {results[index]['status']}")
+            except Exception as e:
+                Logger.log(f"Could not report rule progress: {str(e)}", "DEBUG")
+                
+        created = sum(1 for result in results if result["status"] == "created")
+        return {
+            "status": "completed",
+            "created": created,
+            "failed": len(results) - created,
+            "results": results
+        }
+        
+    except Exception as e:
+        Logger.log(f"Error configuring rules: {str(e)}", "ERROR")
+        return {"status": "error", "message": str(e)}
+
+async def _post_sac_rule_versioned(payload: Dict[str, Any], tenant_uuid: str, version_control: int) -> Tuple[Dict[str, Any], int]:
+    """
+    Post a SAC rule with the given versionControl, retrying on conflicts.
+    
+    Returns the result and the versionControl to use for the next post.
+    """
+    url = f"{sac_config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/sase/secure-access-client/rule"
+    try:
+        for attempt in range(sac_config.conflict_retries + 1):
+            payload["versionControl"] = version_control
+            response = await sac_api_client.post_resource(url, payload)
+            sac_resource_manager.invalidate_rules(tenant_uuid)
+            
+            # Either way versionControl has moved: by this post or by someone else's change
+            if response.status_code < 400 or response.status_code == 409:
+                latest = await sac_resource_manager.fetch_version_control(tenant_uuid)
+                if latest is not None:
+                    version_control = latest
+            if response.status_code != 409 or attempt == sac_config.conflict_retries:
+                break
+            Logger.log(f"versionControl conflict posting rule '{payload['name']}', retrying", "WARNING")
+            await asyncio.sleep(retry_delay(attempt))
+            
+        response.raise_for_status()
+        Logger.log(f"Rule '{payload['name']}' posted successfully")
+        return {"rule": payload["name"], "status": "created", "response": response.json()}, version_control
+        
+    except httpx.HTTPStatusError as e:
+        Logger.log(f"HTTP Error posting rule '{payload['name']}': {str(e)}", "ERROR")
+        try:
+            message = response.json()
+        except ValueError:
+            message = response.text
+        return {"rule": payload["name"], "status": "error", "message": message}, version_control
+        
+    except Exception as e:
+        Logger.log(f"Error posting rule '{payload['name']}': {str(e)}", "ERROR")
+        return {"rule": payload["name"], "status": "error", "message": str(e)}, version_control
+
+async def _post_sac_rule(payload: Dict[str, Any], tenant_uuid: str) -> Dict[str, Any]:
     """Post a SAC rule to the API"""
     try:
-        url = f"{sac_config.concerto_url}/portalapi/v1/tenants/{sac_api_client.auth_context.tenant_uuid}/sase/secure-access-client/rule"
-        response = sac_api_client.post_resource(url, payload)
+        url = f"{sac_config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/sase/secure-access-client/rule"
+        response = await sac_api_client.post_resource(url, payload)
+        # A created rule or a versionControl conflict both mean the cached rules are outdated
+        sac_resource_manager.invalidate_rules(tenant_uuid)
         response.raise_for_status()
         
         Logger.log("Rule posted successfully")
         return {"status": "success", "response": response.json()}
         
-    except requests.exceptions.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         Logger.log(f"HTTP Error posting rule: {str(e)}", "ERROR")
         try:
             return {"status": "error", "message": response.json()}
@@ -1430,11 +1807,12 @@ async def _post_sac_rule(payload: Dict[str, Any]) -> Dict[str, Any]:
         Logger.log(f"Error posting rule: {str(e)}", "ERROR")
         return {"status": "error", "message": str(e)}
 
-async def _delete_single_sac_rule(rule: Dict[str, str]) -> Dict[str, Any]:
+async def _delete_single_sac_rule(rule: Dict[str, str], tenant_uuid: str) -> Dict[str, Any]:
     """Delete a single SAC rule"""
     try:
-        url = f"{sac_config.concerto_url}/portalapi/v1/tenants/{sac_api_client.auth_context.tenant_uuid}/sase/secure-access-client/{rule['uuid']}"
-        response = sac_api_client.delete_resource(url)
+        url = f"{sac_config.concerto_url}/portalapi/v1/tenants/{tenant_uuid}/sase/secure-access-client/{rule['uuid']}"
+        response = await sac_api_client.delete_resource(url)
+        sac_resource_manager.invalidate_rules(tenant_uuid)
         
         if response.status_code == 200:
             Logger.log(f"Deleted rule '{rule['name']}' successfully")
@@ -1453,10 +1831,20 @@ async def _delete_single_sac_rule(rule: Dict[str, str]) -> Dict[str, Any]:
             "details": str(e)
         }
 
+@asynccontextmanager
+async def lifespan(app):
+    """Warm up the Concerto login and close the Concerto and SAC connection pools on shutdown"""
+    async with concerto.lifespan(app):
+        try:
+            yield
+        finally:
+            await sac_api_client.aclose()
+
 app = Starlette(
     routes=[
         Mount('/', mcp.sse_app()),
-    ]
+    ],
+    lifespan=lifespan,
 )
 
 if __name__ == "__main__":
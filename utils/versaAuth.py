@@ -0,0 +1,158 @@
+# OAuth token handling for the Director and Concerto sessions
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+import jwt
+
+from utils.versaHttp import env_float
+
+logger = logging.getLogger(__name__)
+
+TOKEN_REQUEST_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+
+
+class TokenManager:
+    """
+    Issues and refreshes bearer tokens without blocking the event loop.
+
+    Nothing is requested until the first call (or warm_up()), so creating a
+    manager never blocks on the network. Concurrent callers that find the
+    token expired share a single login. Once a token is within ``skew``
+    seconds of its ``exp`` it is refreshed in the background while callers
+    keep using the still-valid token. The refresh_token grant is used when
+    the server issued a refresh token, falling back to the password grant
+    if it is rejected.
+
+    With a state backend (see versaState) the token is shared between
+    worker processes: a refresh takes the backend lock and adopts a token
+    another worker already obtained instead of logging in again.
+    """
+
+    def __init__(
+        self,
+        token_url: str,
+        payload: Dict[str, Any],
+        client: Optional[Callable[[], httpx.AsyncClient]] = None,
+        skew: Optional[float] = None,
+        state: Optional[Any] = None,
+    ):
+        self.token_url = token_url
+        self.payload = payload
+        self._client = client
+        self.state = state
+        self._state_key = f"token:{token_url}:{payload.get('username', '')}"
+        self.skew = skew if skew is not None else env_float("VN_TOKEN_REFRESH_SKEW", 60.0)
+        self.access_token: Optional[str] = None
+        self.refresh_token: Optional[str] = None
+        self.headers: Dict[str, str] = {}
+        # Wall-clock expiry (shared with other workers) and monotonic deadlines
+        # derived once per token, so the hot path never decodes the JWT
+        self._expires = 0.0
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._lock = asyncio.Lock()
+        self._background: Optional[asyncio.Task] = None
+
+    async def get_header(self) -> Dict[str, str]:
+        """Return the Authorization headers, refreshing the token when needed"""
+        now = time.monotonic()
+        if now < self._refresh_at:
+            return self.headers
+
+        if now >= self._expires_at:
+            await self.refresh()
+        else:
+            self._refresh_in_background()
+        return self.headers
+
+    async def get_token(self) -> str:
+        """Return a valid access token"""
+        await self.get_header()
+        return self.access_token
+
+    async def refresh(self, force: bool = False):
+        """Obtain a new token; concurrent callers wait for the same login"""
+        stale = self.access_token
+        async with self._lock:
+            if not force and self.access_token is not stale and time.monotonic() < self._expires_at:
+                # Another caller refreshed while we were waiting
+                return
+            if self.state is None:
+                await self._issue()
+                return
+
+            async with self.state.lock(self._state_key):
+                shared = await self.state.get(self._state_key)
+                if shared and shared["access_token"] != stale and shared["expires"] - time.time() > self.skew:
+                    # Another worker refreshed while we were waiting
+                    self._use(shared["access_token"], shared["refresh_token"], shared["expires"])
+                    return
+                await self._issue()
+                await self.state.set(
+                    self._state_key,
+                    {"access_token": self.access_token, "refresh_token": self.refresh_token, "expires": self._expires},
+                    self._expires - time.time(),
+                )
+
+    def warm_up(self):
+        """Log in in the background so the first call finds a token ready"""
+        if self.access_token is None:
+            self._refresh_in_background()
+
+    def _refresh_in_background(self):
+        if self._background is None or self._background.done():
+            self._background = asyncio.create_task(self.refresh())
+            self._background.add_done_callback(self._log_background_failure)
+
+    @staticmethod
+    def _log_background_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background token refresh failed: %s", task.exception())
+
+    async def _issue(self):
+        if self.refresh_token:
+            payload = {k: v for k, v in self.payload.items() if k not in ("username", "password", "grant_type")}
+            payload.update(grant_type="refresh_token", refresh_token=self.refresh_token)
+            try:
+                self._accept(await self._post(payload))
+                return
+            except (httpx.HTTPError, KeyError, ValueError) as e:
+                logger.info("refresh_token grant failed (%s), logging in again", e)
+                self.refresh_token = None
+
+        self._accept(await self._post(self.payload))
+
+    async def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self._client is not None:
+            resp = await self._client().post(self.token_url, headers=TOKEN_REQUEST_HEADERS, json=payload)
+        else:
+            async with httpx.AsyncClient(verify=False) as client:
+                resp = await client.post(self.token_url, headers=TOKEN_REQUEST_HEADERS, json=payload)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _accept(self, jsondata: Dict[str, Any]):
+        access_token = jsondata['access_token']
+        decoded_token = jwt.decode(access_token, options={"verify_signature": False})
+        if 'exp' in decoded_token:
+            expires = float(decoded_token['exp'])
+        else:
+            expires = time.time() + float(jsondata['expires_in'])
+        self._use(access_token, jsondata.get('refresh_token') or self.refresh_token, expires)
+
+    def _use(self, access_token: str, refresh_token: Optional[str], expires: float):
+        """Install a token that expires at the wall-clock time expires"""
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.headers = {
+            'Authorization': f'Bearer {self.access_token}',
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        self._expires = expires
+        self._expires_at = time.monotonic() + (expires - time.time())
+        self._refresh_at = self._expires_at - self.skew
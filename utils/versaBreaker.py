@@ -0,0 +1,100 @@
+# Circuit breaker and retry backoff for Director calls
+
+import random
+import time
+from typing import Any, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint class whose circuit is open"""
+
+    def __init__(self, group: str, retry_after: float):
+        super().__init__(f"Director {group} endpoints are failing, not retrying for {retry_after:.0f}s")
+        self.group = group
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Stops calling an endpoint class after repeated failures.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected without touching the network. Once ``reset_timeout``
+    seconds have passed a single probe is let through (half-open); its
+    success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, group: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.group = group
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._probe_at = 0.0
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; in half-open state only one probe may"""
+        if self.state == CLOSED:
+            return True
+        now = time.monotonic()
+        if self.state == OPEN and now - self._opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probe_at = 0.0
+        # A probe that never reported back (e.g. cancelled) is replaced after reset_timeout
+        if self.state == HALF_OPEN and now - self._probe_at >= self.reset_timeout:
+            self._probe_at = now
+            return True
+        return False
+
+    def check(self):
+        """Raise CircuitOpenError unless a call may go out now"""
+        if not self.allow():
+            self.rejected += 1
+            raise CircuitOpenError(self.group, self.retry_after())
+
+    def retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.opened += 1
+            self.state = OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_after": round(self.retry_after(), 1) if self.state != CLOSED else 0.0,
+        }
+
+
+def retry_delay(attempt: int, base: float = 0.2, cap: float = 5.0, retry_after: Optional[str] = None) -> float:
+    """
+    Seconds to wait before retry number ``attempt`` (0-based).
+
+    Uses full jitter over an exponential backoff, so concurrent callers do
+    not retry in lockstep. A numeric Retry-After header is honoured up to cap.
+    """
+    delay = random.uniform(0, min(cap, base * 2 ** attempt))
+    if retry_after:
+        try:
+            delay = max(delay, min(cap, float(retry_after)))
+        except ValueError:
+            pass
+    return delay
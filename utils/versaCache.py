@@ -0,0 +1,128 @@
+# In-process response cache for Director GET tools
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a per-entry TTL.
+
+    Keys are built by the caller, typically from the endpoint name, the
+    resolved path, the query parameters and the identity making the call.
+    Entries may be kept past their TTL so callers can serve them stale.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.stale = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the fresh value for key, or MISSING if absent or past its TTL"""
+        value, stale_for = self.lookup(key)
+        return MISSING if stale_for else value
+
+    def lookup(self, key: Hashable) -> Tuple[Any, float]:
+        """
+        Return (value, stale_for) where stale_for is how many seconds the
+        entry has been past its TTL (0.0 while fresh). Returns (MISSING, 0.0)
+        when the key is absent or no longer retained.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING, 0.0
+
+        fresh_until, expires_at, value = entry
+        now = time.monotonic()
+        if now >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return MISSING, 0.0
+
+        self._entries.move_to_end(key)
+        if now < fresh_until:
+            self.hits += 1
+            return value, 0.0
+        self.stale += 1
+        return value, now - fresh_until
+
+    def set(self, key: Hashable, value: Any, ttl: float, keep_stale: float = 0):
+        """
+        Store value as fresh for ttl seconds and retain it keep_stale seconds
+        longer, evicting the least recently used entries when full.
+        """
+        fresh_until = time.monotonic() + ttl
+        self._entries[key] = (fresh_until, fresh_until + keep_stale, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable = None):
+        """Drop one entry, or everything when no key is given"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale": self.stale,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+class SingleFlight:
+    """
+    Deduplicates identical concurrent calls.
+
+    The first caller for a key starts the upstream call; callers arriving
+    while it is in flight await the same result instead of issuing their
+    own. The call runs as a separate task so a cancelled caller does not
+    cancel it for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.saved = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.calls += 1
+        else:
+            self.saved += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every waiter went away
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight),
+            "upstream_calls": self.calls,
+            "requests_saved": self.saved,
+        }
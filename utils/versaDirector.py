@@ -0,0 +1,421 @@
+# Director session shared by the stdio and SSE servers
+
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+import asyncio
+import json
+import logging
+import os
+import time
+
+import httpx
+
+from utils.versaAuth import TokenManager
+from utils.versaBreaker import CircuitBreaker, CircuitOpenError, retry_delay
+from utils.versaCache import MISSING, SingleFlight, TTLCache
+from utils.versaEP import api_endpoints, endpoint_groups
+from utils.versaHttp import create_async_client, env_bool, env_float, env_int
+from utils.versaLimits import RequestLimits
+from utils.versaPager import CursorRegistry, fetch_pages
+from utils.versaState import create_state
+
+logger = logging.getLogger(__name__)
+
+
+def tool_name(endpoint: str) -> str:
+    """Name of the MCP tool generated for an api_endpoints entry"""
+    return endpoint.lower().replace(' ', '_').replace('-', '_')
+
+
+ENDPOINTS_BY_TOOL = {tool_name(name): name for name in api_endpoints}
+
+# Responses telling us the Director is shedding load
+OVERLOAD_STATUS = (429, 503)
+# Responses worth retrying and counted as failures by the circuit breaker
+RETRY_STATUS = (429, 502, 503, 504)
+
+
+def endpoint_group(policy: Dict[str, Any]) -> str:
+    """Endpoint class from the policy's ``group`` or the first matching URL prefix"""
+    if policy.get("group"):
+        return policy["group"]
+    for group, config in endpoint_groups.items():
+        if any(policy["url"].startswith(prefix) for prefix in config["prefixes"]):
+            return group
+    return "inventory"
+
+
+ENDPOINT_GROUPS = {name: endpoint_group(policy) for name, policy in api_endpoints.items()}
+
+
+def endpoint_setting(endpoint: str, setting: str) -> Any:
+    """Per-endpoint policy value, falling back to the endpoint class default"""
+    policy = api_endpoints[endpoint]
+    return policy.get(setting, endpoint_groups[ENDPOINT_GROUPS[endpoint]].get(setting))
+
+
+class DirectorHTTPError(Exception):
+    """Raised for a non-2xx Director response; data holds the decoded error body"""
+
+    def __init__(self, status_code: int, data: Any):
+        super().__init__(f"Director returned HTTP {status_code}: {str(data)[:200]}")
+        self.status_code = status_code
+        self.data = data
+
+
+ENDPOINT_TIMEOUTS = {
+    name: httpx.Timeout(endpoint_setting(name, "read_timeout"), connect=endpoint_setting(name, "connect_timeout"))
+    for name in api_endpoints
+}
+
+
+class Director:
+    def __init__(self, url, username, password):
+        self.url = url
+        self.username = username
+        self.password = password
+        """ Manages application lifespan """
+        self.payload = {"client_id": os.environ['VN_CLIENT_ID'],
+               "client_secret": os.environ['VN_CLIENT_SECRET'],
+               "username": self.username,
+               "password": self.password,
+               "grant_type": "password"}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._holders = 0
+        self.state = create_state()
+        self.cache = TTLCache(max_entries=env_int("VN_CACHE_MAX_ENTRIES", 1024))
+        self.inflight = SingleFlight()
+        self._revalidating: Set[asyncio.Task] = set()
+        self.stale_served = 0
+        self.stale_fallbacks = 0
+        self.cursors = CursorRegistry(idle_timeout=env_int("VN_CURSOR_IDLE_TIMEOUT", 300))
+        self.limits = RequestLimits(
+            env_int("VN_MAX_CONCURRENCY", 32),
+            endpoint_groups,
+            rate=env_float("VN_RATE_LIMIT", 50.0),
+            burst=env_float("VN_RATE_BURST", 0.0) or None,
+            state=self.state,
+        )
+        self.breakers = {
+            group: CircuitBreaker(group, config.get("failure_threshold", 5), config.get("reset_timeout", 30))
+            for group, config in endpoint_groups.items()
+        }
+        # Logs in on the first tool call, or at startup with VN_AUTH_WARMUP=1
+        self.auth = TokenManager(f"{self.url}/auth/token", self.payload, client=lambda: self.client, state=self.state)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Pooled client reused by every tool call, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = create_async_client()
+        return self._client
+
+    async def aclose(self):
+        """Close the pooled client and its keep-alive connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @asynccontextmanager
+    async def lifespan(self, app):
+        """
+        Lifespan hook for FastMCP/Starlette that releases the pool on shutdown.
+
+        FastMCP enters its lifespan once per session (once per request when
+        stateless), so the hook may be nested inside the app's own lifespan;
+        the pool is only closed when the outermost holder exits. With
+        VN_AUTH_WARMUP=1 the first holder starts logging in in the background.
+        """
+        self._holders += 1
+        if self._holders == 1 and env_bool("VN_AUTH_WARMUP", False):
+            self.auth.warm_up()
+        try:
+            yield
+        finally:
+            self._holders -= 1
+            if not self._holders:
+                await self.aclose()
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self.auth.access_token
+
+    async def regen_token(self):
+        """Force a new login"""
+        await self.auth.refresh(force=True)
+
+    async def get_header(self) -> Dict[str, str]:
+        return await self.auth.get_header()
+
+    async def fetch(self, endpoint: str, url: str, params: Optional[Dict[str, str]] = None, raise_for_status: bool = False) -> Any:
+        """
+        GET an endpoint declared in versaEP.api_endpoints.
+
+        Endpoints with a ``ttl`` policy are answered from the response cache
+        while the entry is fresh. Within ``max_stale`` seconds past the TTL the
+        cached response is returned immediately and refreshed in the
+        background; within ``stale_if_error`` it is returned, wrapped as
+        {"stale": True, ...}, when the Director cannot be reached, and for as
+        long as it is retained while the endpoint class's circuit is open.
+        Identical requests already in flight share one upstream call, and
+        upstream calls wait for a slot in the global and per-class limits,
+        run under the class's timeouts and are retried with jittered backoff
+        on timeouts, connection errors and 429/5xx. Endpoints with a
+        ``cursor`` policy go through the cursor registry, which prefetches
+        the next page. Non-JSON bodies are returned as {"text": ...}.
+        Error responses are returned as data unless ``raise_for_status`` is
+        set, in which case they raise DirectorHTTPError.
+        """
+        policy = api_endpoints[endpoint]
+        try:
+            if policy.get("cursor"):
+                return await self._fetch_cursor(endpoint, url, params or {}, policy)
+            return await self._fetch(endpoint, url, params, policy)
+        except DirectorHTTPError as e:
+            if raise_for_status:
+                raise
+            return e.data
+
+    async def _fetch_cursor(self, endpoint: str, url: str, params: Dict[str, str], policy: Dict[str, Any]) -> Any:
+        try:
+            offset = int(params.get("offset") or 0)
+        except ValueError:
+            return await self._fetch(endpoint, url, params, policy)
+
+        key = (endpoint, url, tuple(sorted((k, v) for k, v in params.items() if k != "offset")), self.username)
+
+        async def fetch_page(page_offset: int) -> Any:
+            return await self._fetch(endpoint, url, {**params, "offset": str(page_offset)}, policy)
+
+        return await self.cursors.page(key, offset, fetch_page)
+
+    async def _fetch(self, endpoint: str, url: str, params: Optional[Dict[str, str]], policy: Dict[str, Any]) -> Any:
+        key = (endpoint, url, tuple(sorted((params or {}).items())), self.username)
+        if not policy.get("ttl"):
+            return await self.inflight.do(key, lambda: self._get(key, url, params, policy))
+
+        cached, stale_for = self.cache.lookup(key)
+        if cached is MISSING and self.state.shared:
+            cached, stale_for = await self._shared_lookup(key)
+        if cached is not MISSING:
+            if not stale_for:
+                return cached
+            if stale_for <= policy.get("max_stale", 0):
+                self.stale_served += 1
+                self._revalidate(self.inflight.do(key, lambda: self._get(key, url, params, policy)))
+                return cached
+
+        try:
+            return await self.inflight.do(key, lambda: self._get(key, url, params, policy))
+        except (httpx.TransportError, CircuitOpenError) as e:
+            # A failed call falls back within stale_if_error; an open circuit
+            # serves whatever is still retained rather than failing outright
+            if cached is MISSING:
+                raise
+            if isinstance(e, httpx.TransportError) and stale_for > policy.get("stale_if_error", 0):
+                raise
+            self.stale_fallbacks += 1
+            return {"stale": True, "stale_seconds": round(stale_for), "data": cached}
+
+    async def _get(self, key, url: str, params: Optional[Dict[str, str]], policy: Dict[str, Any]) -> Any:
+        endpoint = key[0]
+        group = ENDPOINT_GROUPS[endpoint]
+        breaker = self.breakers[group]
+        retries = endpoint_setting(endpoint, "retries") or 0
+        attempt = 0
+        while True:
+            breaker.check()
+            headers = await self.get_header()
+            retry_after = None
+            try:
+                async with self.limits.slot(group) as slot:
+                    try:
+                        response = await self.client.get(url, headers=headers, params=params, timeout=ENDPOINT_TIMEOUTS[endpoint])
+                    except httpx.TimeoutException:
+                        slot.overloaded = True
+                        raise
+                    slot.overloaded = response.status_code in OVERLOAD_STATUS
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                if attempt >= retries:
+                    raise
+                logger.info("%s failed (%s), retrying", endpoint, type(e).__name__)
+            else:
+                if response.status_code not in RETRY_STATUS:
+                    breaker.record_success()
+                    break
+                breaker.record_failure()
+                if attempt >= retries:
+                    break
+                retry_after = response.headers.get("Retry-After")
+                logger.info("%s returned %s, retrying", endpoint, response.status_code)
+            await asyncio.sleep(retry_delay(attempt, retry_after=retry_after))
+            attempt += 1
+
+        # Attempt to return JSON, fall back to text if not valid JSON
+        try:
+            data = response.json()
+        except ValueError:
+            if not response.is_success:
+                raise DirectorHTTPError(response.status_code, {"text": response.text})
+            return {"text": response.text}
+        if not response.is_success:
+            raise DirectorHTTPError(response.status_code, data)
+
+        if policy.get("ttl"):
+            keep_stale = max(policy.get("max_stale", 0), policy.get("stale_if_error", 0))
+            self.cache.set(key, data, policy["ttl"], keep_stale)
+            if self.state.shared:
+                fresh_until = time.time() + policy["ttl"]
+                entry = {"fresh_until": fresh_until, "expires": fresh_until + keep_stale, "data": data}
+                await self.state.set(self._shared_key(key), entry, policy["ttl"] + keep_stale)
+        return data
+
+    @staticmethod
+    def _shared_key(key) -> str:
+        return "cache:" + json.dumps(key)
+
+    async def _shared_lookup(self, key):
+        """Look a response up in the cache shared by the workers, copying a hit into the local cache"""
+        entry = await self.state.get(self._shared_key(key))
+        if entry is None:
+            return MISSING, 0.0
+        now = time.time()
+        self.cache.set(key, entry["data"], entry["fresh_until"] - now, entry["expires"] - entry["fresh_until"])
+        return entry["data"], max(0.0, now - entry["fresh_until"])
+
+    def _revalidate(self, refresh: Awaitable[Any]):
+        """Run a cache refresh in the background, keeping a reference until it finishes"""
+        task = asyncio.ensure_future(refresh)
+        self._revalidating.add(task)
+        task.add_done_callback(self._revalidated)
+
+    def _revalidated(self, task: asyncio.Task):
+        self._revalidating.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background refresh failed: %s", task.exception())
+
+    async def fetch_all(
+        self,
+        tool: str,
+        params: Optional[Dict[str, str]] = None,
+        page_size: int = 100,
+        max_items: int = 0,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Walk a ``paginate`` endpoint from offset to the end of its data.
+
+        Up to VN_PAGINATE_WINDOW pages (default 4) are requested concurrently.
+        Each page goes through fetch(), so it shares the cache and the
+        single-flight with the regular tools. A page that fails, including
+        with an HTTP error status, ends the walk with complete False, the
+        next_offset to resume from and the error.
+        """
+        endpoint = ENDPOINTS_BY_TOOL.get(tool, tool)
+        policy = api_endpoints.get(endpoint)
+        if not policy or not policy.get("paginate"):
+            paginated = [tool_name(n) for n, p in api_endpoints.items() if p.get("paginate")]
+            raise ValueError(f"{tool} does not support pagination. Available: {paginated}")
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        if offset < 0 or max_items < 0:
+            raise ValueError("offset and max_items must not be negative")
+
+        url = f"{self.url}{policy['url']}"
+        query = {k: v for k, v in (params or {}).items() if v and k not in ("limit", "offset")}
+
+        async def fetch_page(page_offset: int, limit: int) -> Any:
+            return await self.fetch(endpoint, url, {**query, "offset": str(page_offset), "limit": str(limit)}, raise_for_status=True)
+
+        return await fetch_pages(
+            fetch_page,
+            page_size=page_size,
+            window=env_int("VN_PAGINATE_WINDOW", 4),
+            max_items=max_items,
+            offset=offset,
+            items_key=policy.get("items_key"),
+        )
+
+    async def fleet_devices(self, tags: str = "", org: str = "") -> List[str]:
+        """Names of the appliances matching tags and/or org; raises RuntimeError if the list is incomplete"""
+        result = await self.fetch_all("get_all_appliances_lite", {"tags": tags, "org": org})
+        if not result["complete"]:
+            raise RuntimeError(f"Appliance list incomplete after {result['count']} devices: {result.get('error')}")
+        return [item["name"] for item in result["items"] if isinstance(item, dict) and item.get("name")]
+
+    async def fan_out(
+        self,
+        tool: str,
+        devices: List[str],
+        params: Optional[Dict[str, str]] = None,
+        concurrency: int = 0,
+        on_result: Optional[Callable[[str, Any, Optional[str]], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run a per-device endpoint (one with a ``device_param`` policy) for every device.
+
+        At most ``concurrency`` requests (default VN_FLEET_CONCURRENCY, 16)
+        run at once. Failures, including non-2xx responses, are collected per
+        device instead of aborting the sweep, and on_result is awaited as
+        each device completes; an exception from on_result is logged and
+        does not affect the results.
+        """
+        endpoint = ENDPOINTS_BY_TOOL.get(tool, tool)
+        policy = api_endpoints.get(endpoint)
+        if not policy or not policy.get("device_param"):
+            supported = [tool_name(n) for n, p in api_endpoints.items() if p.get("device_param")]
+            raise ValueError(f"{tool} is not a per-device query. Available: {supported}")
+
+        device_param = policy["device_param"]
+        placeholder = "{" + device_param + "}"
+        query = {k: v for k, v in (params or {}).items() if v and k in policy["params"] and k != device_param}
+        semaphore = asyncio.Semaphore(concurrency or env_int("VN_FLEET_CONCURRENCY", 16))
+        results: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+
+        async def query_device(device: str):
+            url = f"{self.url}{policy['url']}"
+            device_query = dict(query)
+            if placeholder in url:
+                url = url.replace(placeholder, device)
+            else:
+                device_query[device_param] = device
+
+            error = None
+            async with semaphore:
+                try:
+                    results[device] = await self.fetch(endpoint, url, device_query, raise_for_status=True)
+                except Exception as e:
+                    error = errors[device] = f"{type(e).__name__}: {e}"
+            if on_result is not None:
+                try:
+                    await on_result(device, results.get(device), error)
+                except Exception as e:
+                    logger.debug("Could not report result of %s: %s", device, e)
+
+        await asyncio.gather(*(query_device(device) for device in dict.fromkeys(devices)))
+        return {
+            "endpoint": tool_name(endpoint),
+            "devices": len(results) + len(errors),
+            "succeeded": len(results),
+            "failed": len(errors),
+            "results": results,
+            "errors": errors,
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters describing how requests to the Director were served"""
+        return {
+            "cache": self.cache.stats(),
+            "coalescing": self.inflight.stats(),
+            "stale": {
+                "served_while_revalidating": self.stale_served,
+                "served_on_error": self.stale_fallbacks,
+                "revalidating": len(self._revalidating),
+            },
+            "cursors": self.cursors.stats(),
+            "limits": self.limits.stats(),
+            "breakers": {group: breaker.stats() for group, breaker in self.breakers.items()},
+            "state": self.state.stats(),
+        }
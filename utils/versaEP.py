@@ -1,4 +1,22 @@
 # Define the API endpoints (GET only)
+#
+# Optional per-endpoint policy keys:
+#   ttl             - seconds a successful response may be served from the in-process cache
+#   max_stale       - seconds past ttl a response is still served instantly while it is
+#                     refreshed in the background (stale-while-revalidate)
+#   stale_if_error  - seconds past ttl a response may be returned, marked stale, when the
+#                     Director cannot be reached or times out
+#   paginate        - limit/offset endpoint that fetch_all_pages may walk to the end
+#   items_key       - response field holding the page items, when it cannot be inferred
+#   cursor          - offset-paged query session; the next page is prefetched while the
+#                     client consumes the current one
+#   device_param    - parameter naming the appliance, for endpoints fleet_query can fan out
+#   group           - endpoint class for concurrency limits, timeouts and the circuit
+#                     breaker, overriding the URL-prefix match in endpoint_groups
+#   connect_timeout - seconds to establish a connection, overriding the class default
+#   read_timeout    - seconds to wait for the response, overriding the class default
+#   retries         - extra attempts after a timeout, connection error or 429/5xx,
+#                     overriding the class default
 api_endpoints = {
     "Get All Appliance Status": {
         "url": "/nextgen/appliance/status",
@@ -28,7 +46,8 @@ api_endpoints = {
     "Get Routing Instance Information": {
         "url": "/vnms/appliance/{applianceName}/routing-instances",
         "method": "GET",
-        "params": ["applianceName"]
+        "params": ["applianceName"],
+        "device_param": "applianceName"
     },
     "Get All Appliances By Type and Tags": {
         "url": "/vnms/appliance/appliance",
@@ -38,7 +57,8 @@ api_endpoints = {
     "Get All Appliances Lite": {
         "url": "/vnms/appliance/appliance/lite",
         "method": "GET",
-        "params": ["filterString", "limit", "offset", "org", "tags"]
+        "params": ["filterString", "limit", "offset", "org", "tags"],
+        "paginate": True
     },
     "Get All Appliances LiteView": {
         "url": "/vnms/appliance/appliance/liteView",
@@ -63,12 +83,14 @@ api_endpoints = {
     "Get Audit Logs": {
         "url": "/vnms/audit/logs",
         "method": "GET",
-        "params": ["limit", "offset", "searchKey"]
+        "params": ["limit", "offset", "searchKey"],
+        "paginate": True
     },
     "Device WorkFlow Fetch All": {
         "url": "/vnms/sdwan/workflow/devices",
         "method": "GET",
-        "params": ["filters", "limit", "offset", "orgname"]
+        "params": ["filters", "limit", "offset", "orgname"],
+        "paginate": True
     },
     "Get Specific Device WorkFlow": {
         "url": "/vnms/sdwan/workflow/devices/device/{deviceName}",
@@ -103,7 +125,8 @@ api_endpoints = {
     "Get All Model Numbers": {
         "url": "/nextgen/deviceGroup/modelNumbers",
         "method": "GET",
-        "params": []  # This API doesn't have any parameters
+        "params": [],  # This API doesn't have any parameters
+        "ttl": 3600
     },
     "Show Templates Associated to Device": {
         "url": "/nextgen/device/{deviceName}",
@@ -113,12 +136,14 @@ api_endpoints = {
     "Get All Assets": {
         "url": "/vnms/assets/asset",
         "method": "GET",
-        "params": ["filters", "limit", "offset", "organization"]
+        "params": ["filters", "limit", "offset", "organization"],
+        "paginate": True
     },
     "Get Next Page Data": {
         "url": "/vnms/dashboard/appliance/next_page_data",
         "method": "GET",
-        "params": ["filters", "offset", "queryId"]
+        "params": ["filters", "offset", "queryId"],
+        "cursor": True
     },
     "Get Appliance Details by UUID": {
         "url": "/vnms/dashboard/appliance/{Uuid}",
@@ -138,12 +163,15 @@ api_endpoints = {
     "Get Appliance Capabilities": {
         "url": "/vnms/dashboard/appliance/{applianceName}/capabilities",
         "method": "GET",
-        "params": ["applianceName"]
+        "params": ["applianceName"],
+        "ttl": 900,
+        "device_param": "applianceName"
     },
     "Get Appliance Live Status": {
         "url": "/vnms/dashboard/appliance/{applianceName}/live",
         "method": "GET",
-        "params": ["applianceName", "command", "decode", "fetch", "filters", "uuid"]
+        "params": ["applianceName", "command", "decode", "fetch", "filters", "uuid"],
+        "group": "live"
     },
     "Get Appliance Sync Status": {
         "url": "/vnms/dashboard/appliance/{applianceUUID}/syncStatus",
@@ -153,7 +181,8 @@ api_endpoints = {
     "Get Appliance Services": {
         "url": "/vnms/dashboard/applianceServices/{applianceName}",
         "method": "GET",
-        "params": ["applianceName"]
+        "params": ["applianceName"],
+        "device_param": "applianceName"
     },
     "Get Appliance Status": {
         "url": "/vnms/dashboard/applianceStatus/{applianceUUID}",
@@ -173,12 +202,14 @@ api_endpoints = {
     "Get All Appliances Basic Details": {
         "url": "/vnms/cloud/systems/getAllAppliancesBasicDetails",
         "method": "GET",
-        "params": ["limit", "offset"]
+        "params": ["limit", "offset"],
+        "paginate": True
     },
     "Get Appliance Violations": {
         "url": "/vnms/dashboard/applianceviolations/{applianceName}",
         "method": "GET",
-        "params": ["applianceName"]
+        "params": ["applianceName"],
+        "device_param": "applianceName"
     },
     "Get Enable Monitoring": {
         "url": "/vnms/dashboard/enableMonitoring",
@@ -193,22 +224,28 @@ api_endpoints = {
     "Get Health IKE": {
         "url": "/vnms/dashboard/health/ike",
         "method": "GET",
-        "params": ["deviceName"]
+        "params": ["deviceName"],
+        "device_param": "deviceName"
     },
     "Get Health Interface": {
         "url": "/vnms/dashboard/health/interface",
         "method": "GET",
-        "params": ["deviceName"]
+        "params": ["deviceName"],
+        "device_param": "deviceName"
     },
     "Get Health Path": {
         "url": "/vnms/dashboard/health/path",
         "method": "GET",
-        "params": ["deviceName"]
+        "params": ["deviceName"],
+        "device_param": "deviceName"
     },
     "Get Devices in LTE": {
         "url": "/vnms/dashboard/lte/list",
         "method": "GET",
-        "params": []
+        "params": [],
+        "ttl": 30,
+        "max_stale": 300,
+        "stale_if_error": 3600
     },
     "Get Nav Tree Node": {
         "url": "/vnms/dashboard/navTree",
@@ -218,7 +255,10 @@ api_endpoints = {
     "Get Head-End Status": {
         "url": "/vnms/dashboard/status/headEnds",
         "method": "GET",
-        "params": []
+        "params": [],
+        "ttl": 30,
+        "max_stale": 300,
+        "stale_if_error": 3600
     },
     "Get VD Status": {
         "url": "/vnms/dashboard/vdStatus",
@@ -228,12 +268,16 @@ api_endpoints = {
     "Get VD HA Details": {
         "url": "/vnms/dashboard/vdStatus/haDetails",
         "method": "GET",
-        "params": []
+        "params": [],
+        "ttl": 30,
+        "max_stale": 300,
+        "stale_if_error": 3600
     },
     "Get VD Package Info": {
         "url": "/vnms/dashboard/vdStatus/packageInfo",
         "method": "GET",
-        "params": []
+        "params": [],
+        "ttl": 3600
     },
     "Get Sys Details": {
         "url": "/vnms/dashboard/vdStatus/sysDetails",
@@ -243,7 +287,10 @@ api_endpoints = {
     "Get Sys Uptime": {
         "url": "/vnms/dashboard/vdStatus/sysUptime",
         "method": "GET",
-        "params": []
+        "params": [],
+        "ttl": 30,
+        "max_stale": 300,
+        "stale_if_error": 3600
     },
     "Filter Paginate Alarm": {
         "url": "/vnms/fault/alarms/page",
@@ -271,7 +318,8 @@ api_endpoints = {
     "Get Alarm Types": {
         "url": "/vnms/fault/types",
         "method": "GET",
-        "params": []
+        "params": [],
+        "ttl": 3600
     },
     "Get All Filtered Alarms": {
         "url": "/vnms/fault/alarms",
@@ -292,17 +340,20 @@ api_endpoints = {
     "Get Appliance Alarm Model": {
         "url": "/vnms/fault/appliance/alarm_model",
         "method": "GET",
-        "params": []
+        "params": [],
+        "ttl": 3600
     },
     "Get Appliance Alarm Types": {
         "url": "/vnms/fault/appliance/types",
         "method": "GET",
-        "params": []
+        "params": [],
+        "ttl": 3600
     },
     "Get Device Alarm Summary": {
         "url": "/vnms/fault/alarms/summary/device/{deviceName}",
         "method": "GET",
-        "params": ["deviceName", "org"]
+        "params": ["deviceName", "org"],
+        "device_param": "deviceName"
     },
     "Get Director Alarm Summary": {
         "url": "/vnms/fault/director/alarms/summary",
@@ -340,3 +391,68 @@ api_endpoints = {
         "params": ["device_name", "managed_object", "org", "type", "specific_problem"]
     },
 }
+
+# Endpoint classes, each with its own concurrency limit toward the Director.
+# An endpoint belongs to the first class one of whose prefixes its URL starts
+# with, or to "inventory" when none match. Classes without prefixes, such as
+# "live", are only reached through an endpoint's group key.
+#   max_concurrency - upper bound on requests of this class in flight at once
+#   latency_target  - seconds; slower responses shrink the limit like a 429/503 does
+#   connect_timeout - seconds to establish a connection
+#   read_timeout    - seconds to wait for the response
+#   retries         - extra attempts, with jittered backoff, after a timeout,
+#                     connection error or 429/5xx
+#   failure_threshold - consecutive failures that open the class's circuit breaker
+#   reset_timeout   - seconds an open circuit fails fast before letting a probe through
+endpoint_groups = {
+    "dashboard": {
+        "prefixes": ["/vnms/dashboard/"],
+        "max_concurrency": 8,
+        "latency_target": 10,
+        "connect_timeout": 5,
+        "read_timeout": 30,
+        "retries": 1,
+        "failure_threshold": 5,
+        "reset_timeout": 30
+    },
+    "live": {
+        "prefixes": [],
+        "max_concurrency": 4,
+        "latency_target": 30,
+        "connect_timeout": 5,
+        "read_timeout": 60,
+        "retries": 0,
+        "failure_threshold": 3,
+        "reset_timeout": 60
+    },
+    "fault": {
+        "prefixes": ["/vnms/fault/"],
+        "max_concurrency": 8,
+        "latency_target": 5,
+        "connect_timeout": 5,
+        "read_timeout": 20,
+        "retries": 2,
+        "failure_threshold": 5,
+        "reset_timeout": 30
+    },
+    "workflow": {
+        "prefixes": ["/vnms/sdwan/workflow/", "/vnms/alltypes/workflow/"],
+        "max_concurrency": 4,
+        "latency_target": 5,
+        "connect_timeout": 5,
+        "read_timeout": 30,
+        "retries": 1,
+        "failure_threshold": 5,
+        "reset_timeout": 30
+    },
+    "inventory": {
+        "prefixes": [],
+        "max_concurrency": 16,
+        "latency_target": 5,
+        "connect_timeout": 5,
+        "read_timeout": 15,
+        "retries": 2,
+        "failure_threshold": 5,
+        "reset_timeout": 30
+    },
+}
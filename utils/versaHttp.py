@@ -0,0 +1,53 @@
+# Pooled httpx client shared by the Versa API tools
+
+import os
+
+import httpx
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment"""
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """Read a boolean setting (1/0, true/false, yes/no) from the environment"""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])"""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_async_client(**kwargs) -> httpx.AsyncClient:
+    """
+    Create a long-lived AsyncClient with connection pooling, keep-alive and HTTP/2.
+
+    The pool is tuned through the environment:
+        VN_HTTP_MAX_CONNECTIONS   maximum open connections (default 100)
+        VN_HTTP_MAX_KEEPALIVE     idle connections kept for reuse (default 20)
+        VN_HTTP_KEEPALIVE_EXPIRY  seconds an idle connection is kept (default 60)
+        VN_HTTP2                  negotiate HTTP/2 when possible (default 1)
+    """
+    limits = httpx.Limits(
+        max_connections=env_int("VN_HTTP_MAX_CONNECTIONS", 100),
+        max_keepalive_connections=env_int("VN_HTTP_MAX_KEEPALIVE", 20),
+        keepalive_expiry=env_float("VN_HTTP_KEEPALIVE_EXPIRY", 60.0),
+    )
+    http2 = env_bool("VN_HTTP2", True) and http2_available()
+    return httpx.AsyncClient(verify=False, http2=http2, limits=limits, **kwargs)
@@ -0,0 +1,222 @@
+# Concurrency and rate limits for requests sent to the Director
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit adjusted with AIMD.
+
+    Each completed request grows the limit by 1/limit (about +1 per limit
+    requests, up to ``max_limit``). A request that was rejected as
+    overloaded (429/503, timeout) or that took longer than
+    ``latency_target`` halves it, at most once per ``cooldown`` seconds so
+    one burst of slow responses counts once. Waiters are served FIFO.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, latency_target: float = 0.0, cooldown: float = 1.0):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._last_decrease = 0.0
+        self.acquired = 0
+        self.decreases = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the seconds spent waiting"""
+        start = time.monotonic()
+        if self._waiters or self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just as we were cancelled
+                    self.in_flight -= 1
+                    self._wake()
+                elif waiter in self._waiters:
+                    # _wake() already dropped it if the future itself was cancelled
+                    self._waiters.remove(waiter)
+                raise
+        else:
+            self.in_flight += 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def release(self, latency: float, overloaded: bool = False):
+        """Return a slot and adapt the limit to how the request went"""
+        self.in_flight -= 1
+        if overloaded or (self.latency_target and latency > self.latency_target):
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self.limit = max(float(self.min_limit), self.limit / 2)
+                self._last_decrease = now
+                self.decreases += 1
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": int(self.limit),
+            "max_limit": self.max_limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "acquired": self.acquired,
+            "decreases": self.decreases,
+            "avg_wait_ms": round(1000 * self.total_wait / self.acquired, 1) if self.acquired else 0.0,
+            "max_wait_ms": round(1000 * self.max_wait, 1),
+        }
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter with AIMD on the refill rate.
+
+    ``decrease()`` halves the rate after an overload signal and
+    ``increase()`` adds back 1/rate per successful request, up to the
+    configured rate. With a shared state backend the bucket itself lives in
+    the backend, so the rate applies to all worker processes together.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, min_rate: float = 1.0, state: Optional[Any] = None):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.state = state if state is not None and state.shared else None
+        self.waited = 0
+        self.total_wait = 0.0
+
+    async def acquire(self) -> float:
+        """Take one token, waiting for the refill if needed; returns the seconds waited"""
+        if self.state is not None:
+            waited = await self.state.reserve("rate", self.rate, self.burst)
+            if waited:
+                await asyncio.sleep(waited)
+        else:
+            waited = 0.0
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    delay = (1 - self.tokens) / self.rate
+                    await asyncio.sleep(delay)
+                    waited += delay
+
+        if waited:
+            self.waited += 1
+            self.total_wait += waited
+        return waited
+
+    def decrease(self):
+        self.rate = max(self.min_rate, self.rate / 2)
+
+    def increase(self):
+        self.rate = min(self.max_rate, self.rate + 1 / self.rate)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": round(self.rate, 2),
+            "max_rate": self.max_rate,
+            "burst": self.burst,
+            "waited": self.waited,
+            "total_wait_ms": round(1000 * self.total_wait, 1),
+        }
+
+
+class Slot:
+    """A granted request slot; set ``overloaded`` when the server pushed back"""
+
+    def __init__(self):
+        self.overloaded = False
+
+
+class RequestLimits:
+    """
+    Global and per-group concurrency limits plus a global rate limit.
+
+    A request first takes a rate token, then a slot in its group and then a
+    global slot, so requests queued on a saturated group never hold global
+    slots that other groups could use.
+    """
+
+    def __init__(
+        self,
+        global_limit: int,
+        groups: Dict[str, Dict[str, Any]],
+        rate: float = 0.0,
+        burst: Optional[float] = None,
+        state: Optional[Any] = None,
+    ):
+        self.global_limiter = AdaptiveLimiter(global_limit)
+        self.groups = {
+            name: AdaptiveLimiter(
+                config.get("max_concurrency", global_limit),
+                latency_target=config.get("latency_target", 0.0),
+            )
+            for name, config in groups.items()
+        }
+        self.bucket = TokenBucket(rate, burst, state=state) if rate else None
+
+    @asynccontextmanager
+    async def slot(self, group: str) -> AsyncIterator[Slot]:
+        if self.bucket is not None:
+            await self.bucket.acquire()
+        limiter = self.groups[group]
+        await limiter.acquire()
+        try:
+            await self.global_limiter.acquire()
+        except BaseException:
+            limiter.release(0.0)
+            raise
+
+        slot = Slot()
+        start = time.monotonic()
+        try:
+            yield slot
+        finally:
+            latency = time.monotonic() - start
+            self.global_limiter.release(latency, slot.overloaded)
+            limiter.release(latency, slot.overloaded)
+            if self.bucket is not None:
+                if slot.overloaded:
+                    self.bucket.decrease()
+                else:
+                    self.bucket.increase()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "global": self.global_limiter.stats(),
+            "groups": {name: limiter.stats() for name, limiter in self.groups.items()},
+            "rate": self.bucket.stats() if self.bucket is not None else None,
+        }
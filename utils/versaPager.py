@@ -0,0 +1,225 @@
+# Pagination helpers for limit/offset Director endpoints
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOTAL_KEYS = ("totalCount", "total_count", "totalcount", "total")
+
+
+def extract_page(data: Any, items_key: Optional[str] = None) -> Tuple[List[Any], Optional[int]]:
+    """
+    Find the list of items and the total count in one page of a response.
+
+    Director list responses are either a bare list, a dict holding the list
+    next to a total count, or such a dict wrapped in a single-key envelope
+    (e.g. {"versanms.ApplianceStatusResult": {...}}). Without an explicit
+    items_key the longest list in the page is taken as the items.
+    """
+    while isinstance(data, dict) and len(data) == 1:
+        inner = next(iter(data.values()))
+        if not isinstance(inner, dict):
+            break
+        data = inner
+
+    if isinstance(data, list):
+        return data, None
+    if not isinstance(data, dict):
+        return [], None
+
+    total = next((data[k] for k in TOTAL_KEYS if isinstance(data.get(k), int)), None)
+    if items_key is not None:
+        items = data.get(items_key)
+        return (items if isinstance(items, list) else []), total
+
+    lists = [v for v in data.values() if isinstance(v, list)]
+    return (max(lists, key=len) if lists else []), total
+
+
+async def fetch_pages(
+    fetch_page: Callable[[int, int], Awaitable[Any]],
+    page_size: int = 100,
+    window: int = 4,
+    max_items: int = 0,
+    offset: int = 0,
+    items_key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Walk a limit/offset endpoint, keeping up to ``window`` page requests in flight.
+
+    Pages are consumed in order and fetching stops at the first short or
+    empty page or at the reported total count. When ``max_items`` is reached, or a page
+    request fails, the result carries ``next_offset`` so the walk can be
+    resumed later; a failure is reported in ``error`` rather than raised.
+    """
+    items: List[Any] = []
+    total: Optional[int] = None
+    next_offset = offset
+    error = None
+    try:
+        first = await fetch_page(offset, page_size)
+    except Exception as e:
+        return _page_result(items, total, False, next_offset, f"{type(e).__name__}: {e}")
+    page_items, total = extract_page(first, items_key)
+    items.extend(page_items)
+    next_offset += len(page_items)
+    complete = not page_items or len(page_items) < page_size or (total is not None and next_offset >= total)
+
+    pending: deque = deque()
+    scheduled = next_offset
+
+    def schedule():
+        nonlocal scheduled
+        while len(pending) < window:
+            if total is not None and scheduled >= total:
+                return
+            if max_items and scheduled - offset >= max_items:
+                return
+            pending.append(asyncio.ensure_future(fetch_page(scheduled, page_size)))
+            scheduled += page_size
+
+    try:
+        if not complete:
+            schedule()
+        while pending and not complete:
+            try:
+                page = await pending.popleft()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                break
+            page_items, _ = extract_page(page, items_key)
+            items.extend(page_items)
+            next_offset += len(page_items)
+            if not page_items or len(page_items) < page_size or (total is not None and next_offset >= total):
+                complete = True
+            else:
+                schedule()
+    finally:
+        for task in pending:
+            task.cancel()
+            task.add_done_callback(_consume_exception)
+
+    if max_items and len(items) > max_items:
+        next_offset -= len(items) - max_items
+        del items[max_items:]
+        complete = False
+
+    return _page_result(items, total, complete, next_offset, error)
+
+
+def _page_result(items: List[Any], total: Optional[int], complete: bool, next_offset: int, error: Optional[str]) -> Dict[str, Any]:
+    result = {
+        "items": items,
+        "count": len(items),
+        "total": total,
+        "complete": complete,
+        "next_offset": None if complete else next_offset,
+    }
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+def _consume_exception(task: asyncio.Task):
+    # A failed prefetch is retried by the next page() call; don't warn about it
+    if not task.cancelled():
+        task.exception()
+
+
+@dataclass
+class _Cursor:
+    """Server-side state of one paged query"""
+    offset: int
+    last_offset: int
+    last_count: int
+    prefetch: Optional[asyncio.Task]
+    last_used: float
+
+
+class CursorRegistry:
+    """
+    Tracks paged query sessions and prefetches the page a client will ask for next.
+
+    A cursor is keyed on everything but the offset (query id, filters and
+    identity). After serving a page, the next offset is predicted from the
+    number of items returned, or from the client's own step when it pages
+    by a fixed increment, and fetched in the background. Cursors idle for longer than
+    ``idle_timeout`` seconds are dropped together with their prefetch.
+    """
+
+    def __init__(self, idle_timeout: float = 300, max_cursors: int = 256):
+        self.idle_timeout = idle_timeout
+        self.max_cursors = max_cursors
+        self._cursors: "OrderedDict[Hashable, _Cursor]" = OrderedDict()
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+        self.expired = 0
+
+    async def page(self, key: Hashable, offset: int, fetch_page: Callable[[int], Awaitable[Any]]) -> Any:
+        """Return the page at offset, from the prefetch when the cursor predicted it"""
+        self._expire()
+        cursor = self._cursors.pop(key, None)
+        data = None
+        if cursor is not None and cursor.prefetch is not None:
+            if cursor.offset == offset:
+                try:
+                    data = await asyncio.shield(cursor.prefetch)
+                    self.prefetch_hits += 1
+                except Exception as e:
+                    logger.info("Prefetch of offset %s failed (%s), fetching again", offset, e)
+            else:
+                cursor.prefetch.cancel()
+        if data is None:
+            self.prefetch_misses += 1
+            data = await fetch_page(offset)
+
+        items, _ = extract_page(data)
+        if not items:
+            # End of data, nothing left to prefetch
+            return data
+
+        # Clients either advance by the number of items they received or by a
+        # fixed page step; follow whichever the previous request showed
+        step = len(items)
+        if cursor is not None and offset > cursor.last_offset and offset - cursor.last_offset != cursor.last_count:
+            step = offset - cursor.last_offset
+        next_offset = offset + step
+        prefetch = asyncio.ensure_future(fetch_page(next_offset))
+        prefetch.add_done_callback(_consume_exception)
+        self._cursors[key] = _Cursor(
+            offset=next_offset,
+            last_offset=offset,
+            last_count=len(items),
+            prefetch=prefetch,
+            last_used=time.monotonic(),
+        )
+        while len(self._cursors) > self.max_cursors:
+            self._drop(self._cursors.popitem(last=False)[1])
+        return data
+
+    def _expire(self):
+        deadline = time.monotonic() - self.idle_timeout
+        while self._cursors:
+            key, cursor = next(iter(self._cursors.items()))
+            if cursor.last_used > deadline:
+                break
+            del self._cursors[key]
+            self._drop(cursor)
+
+    def _drop(self, cursor: _Cursor):
+        self.expired += 1
+        if cursor.prefetch is not None:
+            cursor.prefetch.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "open": len(self._cursors),
+            "prefetch_hits": self.prefetch_hits,
+            "prefetch_misses": self.prefetch_misses,
+            "expired": self.expired,
+        }
@@ -0,0 +1,239 @@
+# State shared between server worker processes (tokens, cached responses, rate limit)
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+LOCK_POLL_INTERVAL = 0.05
+# Never follow a symlink planted where a state or lock file is expected
+O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+
+def _check_owned(path: str, st: os.stat_result, directory: bool = False):
+    """Refuse state files or directories that another user owns or can write to"""
+    if not hasattr(os, "getuid"):  # Windows: no ownership model to check
+        return
+    if st.st_uid != os.getuid():
+        raise PermissionError(f"{path} is owned by uid {st.st_uid}, not by this process (uid {os.getuid()})")
+    if directory and st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"{path} is writable by other users")
+
+
+def default_state_dir() -> str:
+    """Per-user private directory for the state database (0700)"""
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    user = os.getuid() if hasattr(os, "getuid") else os.getlogin()
+    return os.path.join(base, f"vnmcp-{user}")
+
+
+def private_dir(directory: str) -> str:
+    """Create the directory 0700, or tighten it to 0700 if this user already owns it"""
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode):
+        raise PermissionError(f"{directory} is not a directory")
+    _check_owned(directory, st)
+    if hasattr(os, "getuid") and st.st_mode & 0o077:
+        os.chmod(directory, 0o700)
+    return directory
+
+
+def open_private(path: str) -> int:
+    """Open or create a file readable by this user only, refusing symlinks and foreign files"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | O_NOFOLLOW, 0o600)
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode):
+            raise PermissionError(f"{path} is not a regular file")
+        _check_owned(path, st)
+        if hasattr(os, "getuid") and st.st_mode & 0o077:
+            os.fchmod(fd, 0o600)
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+class MemoryBackend:
+    """
+    State kept in this process only.
+
+    Used when the server runs as a single process. ``shared`` is False, so
+    the Director keeps relying on its own in-process cache and token bucket.
+    """
+
+    shared = False
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[float, Any]] = {}
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+    async def get(self, key: str) -> Any:
+        """Return the value stored under key, or None when absent or expired"""
+        entry = self._values.get(key)
+        if entry is None or entry[0] <= time.time():
+            self._values.pop(key, None)
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: Any, ttl: float):
+        self._values[key] = (time.time() + ttl, value)
+
+    async def reserve(self, bucket: str, rate: float, burst: float) -> float:
+        """Take one token from a token bucket; returns the seconds to wait before using it"""
+        now = time.time()
+        tokens, updated = self._buckets.get(bucket, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate) - 1
+        self._buckets[bucket] = (tokens, now)
+        return max(0.0, -tokens / rate)
+
+    @asynccontextmanager
+    async def lock(self, name: str) -> AsyncIterator[None]:
+        async with self._locks[name]:
+            yield
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "entries": len(self._values)}
+
+
+class SQLiteBackend:
+    """
+    State shared by every process on the host through a SQLite file.
+
+    Values are stored as JSON with an absolute expiry, token buckets are
+    updated in one IMMEDIATE transaction per token, and locks are advisory
+    file locks next to the database. Blocking SQLite calls run in a worker
+    thread so the event loop keeps serving other requests.
+
+    The database holds access tokens, so its directory must belong to this
+    user and not be writable by others, and the files are created 0600
+    (SQLite gives the -wal and -shm files the database's permissions).
+    """
+
+    shared = True
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        _check_owned(directory, os.stat(directory), directory=True)
+        # Tighten files left by an earlier run too; sqlite creates missing -wal/-shm from the database's mode
+        for file_path in (path, f"{path}-wal", f"{path}-shm"):
+            if file_path == path or os.path.lexists(file_path):
+                os.close(open_private(file_path))
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        with self._db_lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._writes = 0
+
+    async def get(self, key: str) -> Any:
+        """Return the value stored under key, or None when absent or expired"""
+        return await asyncio.to_thread(self._get, key)
+
+    def _get(self, key: str) -> Any:
+        with self._db_lock:
+            row = self._db.execute("SELECT value FROM kv WHERE key = ? AND expires > ?", (key, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    async def set(self, key: str, value: Any, ttl: float):
+        await asyncio.to_thread(self._set, key, json.dumps(value), time.time() + ttl)
+
+    def _set(self, key: str, value: str, expires: float):
+        with self._db_lock:
+            self._db.execute("INSERT OR REPLACE INTO kv (key, value, expires) VALUES (?, ?, ?)", (key, value, expires))
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._db.execute("DELETE FROM kv WHERE expires <= ?", (time.time(),))
+
+    async def reserve(self, bucket: str, rate: float, burst: float) -> float:
+        """Take one token from a token bucket; returns the seconds to wait before using it"""
+        return await asyncio.to_thread(self._reserve, bucket, rate, burst)
+
+    def _reserve(self, bucket: str, rate: float, burst: float) -> float:
+        with self._db_lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                row = self._db.execute("SELECT tokens, updated FROM buckets WHERE name = ?", (bucket,)).fetchone()
+                tokens, updated = row if row else (burst, now)
+                tokens = min(burst, tokens + (now - updated) * rate) - 1
+                self._db.execute("INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)", (bucket, tokens, now))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return max(0.0, -tokens / rate)
+
+    @asynccontextmanager
+    async def lock(self, name: str) -> AsyncIterator[None]:
+        """Hold a lock across every process sharing the database"""
+        async with self._locks[name]:
+            if fcntl is None:
+                yield
+                return
+            lock_path = f"{self.path}.{hashlib.sha1(name.encode()).hexdigest()[:16]}.lock"
+            fd = open_private(lock_path)
+            try:
+                # Poll instead of blocking a thread, so a cancelled waiter never ends up owning the lock
+                while True:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        await asyncio.sleep(LOCK_POLL_INTERVAL)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+            finally:
+                os.close(fd)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._db_lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM kv").fetchone()[0]
+        return {"backend": "sqlite", "path": self.path, "entries": entries}
+
+
+_state: Optional[Any] = None
+
+
+def create_state():
+    """
+    Return the process-wide state backend selected by the environment.
+
+        VN_STATE_BACKEND  memory (default) or sqlite
+        VN_STATE_PATH     SQLite file shared by the workers
+                          (default: state.sqlite3 in a private per-user
+                          directory under $XDG_RUNTIME_DIR or the temp directory)
+    """
+    global _state
+    if _state is None:
+        backend = os.environ.get("VN_STATE_BACKEND", "memory").lower()
+        if backend == "sqlite":
+            path = os.environ.get("VN_STATE_PATH")
+            if not path:
+                path = os.path.join(private_dir(default_state_dir()), "state.sqlite3")
+            _state = SQLiteBackend(path)
+        elif backend == "memory":
+            _state = MemoryBackend()
+        else:
+            raise ValueError(f"Unknown VN_STATE_BACKEND {backend!r}, expected memory or sqlite")
+    return _state
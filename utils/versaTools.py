@@ -0,0 +1,148 @@
+# MCP tools for the Director, registered at runtime from versaEP.api_endpoints
+
+import inspect
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from mcp.server.fastmcp import Context, FastMCP
+
+from utils.versaDirector import Director, tool_name
+from utils.versaEP import api_endpoints
+
+
+def param_name(param: str) -> str:
+    """Python identifier used as the tool argument for an API parameter"""
+    return param.replace('-', '_')
+
+
+def endpoint_tool(director: Director, name: str, endpoint: Dict[str, Any]) -> Callable:
+    """
+    Build the tool coroutine for one api_endpoints entry.
+
+    Path parameters are substituted into the URL and the non-empty query
+    parameters are passed on; everything else goes through Director.fetch.
+    The signature is synthesized so FastMCP derives the same input schema
+    the generated per-endpoint functions had.
+    """
+    path_params = re.findall(r'{(\w+)}', endpoint['url'])
+    query_params = [p for p in endpoint['params'] if p not in path_params]
+    base_url = f"{director.url}{endpoint['url']}"
+
+    async def tool(**kwargs) -> Dict[str, Any]:
+        url = base_url
+        for param in path_params:
+            url = url.replace('{' + param + '}', kwargs[param])
+        query = {param: kwargs[param_name(param)] for param in query_params if kwargs.get(param_name(param))}
+        return await director.fetch(name, url, query)
+
+    tool.__name__ = tool_name(name)
+    tool.__qualname__ = tool.__name__
+    tool.__doc__ = f"""
+    {name}
+
+    Method: {endpoint['method']}
+    URL: {endpoint['url']}
+    Parameters: {', '.join(endpoint['params']) if endpoint['params'] else 'None'}
+
+    Returns:
+        JSON response from the API
+    """
+    tool.__signature__ = inspect.Signature(
+        [inspect.Parameter(param_name(p), inspect.Parameter.KEYWORD_ONLY, annotation=str) for p in path_params + query_params],
+        return_annotation=Dict[str, Any],
+    )
+    return tool
+
+
+def register_tools(mcp: FastMCP, director: Director):
+    """Register the server tools and one tool per api_endpoints entry"""
+
+    @mcp.tool()
+    async def get_server_metrics() -> Dict[str, Any]:
+        """
+        Get MCP Server Metrics
+
+        Returns response cache statistics (entries, hits, stale, misses,
+        evictions), request coalescing counters (upstream calls, requests saved)
+        stale-serving counters, query cursor prefetch counters and the request
+        limiter state (current limits, in-flight, queue depth, wait times) and
+        the circuit breaker state per endpoint class for the Director tools
+        served by this process.
+        """
+        return director.metrics()
+
+    @mcp.tool()
+    async def fetch_all_pages(endpoint: str, params: Optional[Dict[str, str]] = None, page_size: int = 100, max_items: int = 0, offset: int = 0) -> Dict[str, Any]:
+        """
+        Fetch All Pages
+
+        Walks a limit/offset endpoint to the end of its data in one call,
+        fetching several pages concurrently, and returns the merged items.
+
+        Supported endpoints: get_all_appliances_lite, get_audit_logs,
+        device_workflow_fetch_all, get_all_assets, get_all_appliances_basic_details
+
+        Parameters:
+        - endpoint: Name of the paginated tool to walk
+        - params: Other query parameters of that tool (e.g. {"org": "Tenant1"})
+        - page_size: Items requested per page, at least 1 (default: 100)
+        - max_items: Stop after this many items and return next_offset as a cursor (default: 0, no limit)
+        - offset: Offset to start from, e.g. the next_offset of a previous call
+
+        Returns:
+            items, count, total (when reported), complete and next_offset, plus
+            error when a page request failed (resume from next_offset)
+        """
+        try:
+            return await director.fetch_all(endpoint, params, page_size, max_items, offset)
+        except ValueError as e:
+            return {"error": str(e)}
+
+    @mcp.tool()
+    async def fleet_query(endpoint: str, ctx: Context, devices: Optional[List[str]] = None, tags: str = "", org: str = "", params: Optional[Dict[str, str]] = None, concurrency: int = 0) -> Dict[str, Any]:
+        """
+        Fleet Query
+
+        Runs a per-device query across many appliances concurrently and returns
+        per-device results and errors. Progress is reported as each device
+        completes.
+
+        Supported endpoints: get_routing_instance_information, get_appliance_capabilities,
+        get_appliance_services, get_appliance_violations, get_health_ike,
+        get_health_interface, get_health_path, get_device_alarm_summary
+
+        Parameters:
+        - endpoint: Name of the per-device tool to run
+        - devices: Appliance names to query
+        - tags: Query every appliance with these tags (used when devices is empty)
+        - org: Query every appliance of this organization (used when devices is empty)
+        - params: Other parameters of that tool (e.g. {"org": "Tenant1"})
+        - concurrency: Maximum simultaneous requests (default: 16)
+
+        Returns:
+            devices, succeeded, failed, results and errors keyed by appliance name
+        """
+        try:
+            if not devices:
+                if not tags and not org:
+                    return {"error": "devices, tags or org is required"}
+                devices = await director.fleet_devices(tags, org)
+                if not devices:
+                    return {"error": "No appliances match the given tags/org"}
+            # fan_out queries each appliance once, so count progress the same way
+            devices = list(dict.fromkeys(devices))
+
+            completed = 0
+
+            async def report(device: str, result: Any, error: Optional[str]):
+                nonlocal completed
+                completed += 1
+                await ctx.report_progress(completed, len(devices))
+                await ctx.info(f"{device}: {error or 'ok'}")
+
+            return await director.fan_out(endpoint, devices, params, concurrency, on_result=report)
+        except (ValueError, RuntimeError) as e:
+            return {"error": str(e)}
+
+    for name, endpoint in api_endpoints.items():
+        mcp.add_tool(endpoint_tool(director, name, endpoint))